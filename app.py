@@ -5,31 +5,64 @@ from wtforms.validators import DataRequired, Length
 from flask_talisman import Talisman
 import os
 from models.sql import User, BlogPost
-from core.db import uow, init_db
+from core.db import uow, init_db, read_system_meta, schema_is_current
+from core.cli import register_commands
+from core.admission import register_admission_control, admission_exempt, ADMISSION
+from core.deadline import register_latency_budgets
+from core.workload import register_workloads, pool_metrics
+from services.blog_export import register_blog_export
+from services.feeds import register_feeds
+import services.blog_related  # noqa: F401  (event listeners keep related posts current)
 from views import register_views
-from core.enum_seed import seed_enums
+from core.enum_seed import seed_enums, enum_seed_fingerprint, ENUM_SEED_HASH_KEY
+from core.enum_registry import ENUMS
 from flask_login import LoginManager
 from sqlalchemy import select
 from utilities.logger import configure_logging
 from services.base import _context, _invert_navbar_colors
 from flask_login import login_required
+from utilities.decorators import role_validation
 from services.chat import register_chat
 
 
 
-def create_app():
+def create_app(auto_bootstrap: bool | None = None):
     app = Flask(__name__)
     app.config.logger = configure_logging(app.config.get("LOG_LEVEL", "DEBUG"))
     app.config['STATIC_FOLDER'] = 'static'
+    # admin dashboards: exact count(*) alongside keyset pages (turn off for very large tables)
+    app.config['DASHBOARD_TOTALS'] = os.environ.get("DASHBOARD_TOTALS", "true").lower() in {"1", "true", "yes"}
 
-    init_db()  # create tables if not exist (dev only; use Alembic in prod)
-    app.config.logger.info("Database initialized.")
+    # Workers only compare the stored schema fingerprint (one query); DDL runs via
+    # `flask --app app bootstrap-db` at deploy time, or here when explicitly enabled (dev).
+    if auto_bootstrap is None:
+        auto_bootstrap = os.environ.get("DB_AUTO_BOOTSTRAP", "false").lower() in {"1", "true", "yes"}
 
-    app.config.logger.info("Seeding enumeration tables...")
-    with uow() as db:
-        seed_enums(db)
-    
-    app.config.logger.info("Enumeration tables seeded.")
+    system_meta = read_system_meta()
+    schema_ready = schema_is_current(system_meta)
+    if schema_ready:
+        app.config.logger.info("Database schema fingerprint matches; skipping bootstrap.")
+    elif auto_bootstrap:
+        init_db()  # create tables if not exist (dev only; use Alembic in prod)
+        schema_ready = True
+        app.config.logger.info("Database initialized.")
+    else:
+        app.config.logger.error(
+            "Database schema fingerprint mismatch; run `flask --app app bootstrap-db`."
+        )
+
+    if schema_ready:
+        # no-op unless the seed data hash differs from the one stored in core.system_meta
+        with uow() as db:
+            if seed_enums(db, known_hash=system_meta.get(ENUM_SEED_HASH_KEY)):
+                app.config.logger.info("Enumeration tables seeded.")
+
+        with uow(readonly=True) as db:
+            ENUMS.reload_if_changed(db, enum_seed_fingerprint())
+        app.config.logger.info("Enumeration registry loaded.")
+
+    # enums are immutable in-process lookups: `enums.currency.get('USD').symbol` in templates
+    app.jinja_env.globals["enums"] = ENUMS
 
     app.config.update(
         SECRET_KEY=os.environ.get("SECRET_KEY"),
@@ -41,7 +74,9 @@ def create_app():
     )
 
     # --- CSRF protection
-    CSRFProtect(app)
+    csrf = CSRFProtect(app)
+    # sendBeacon from statically served blog pages; it only increments an in-memory counter
+    csrf.exempt("views.blog.base.record_post_view")
 
     # --- Content Security Policy (no unsafe-inline; use nonce)
     csp = {
@@ -121,6 +156,7 @@ def create_app():
     }
 
     # --- Talisman security headers
+    # (nginx/default.conf repeats these for exported blog pages it serves from disk)
     Talisman(
         app,
         content_security_policy=csp,
@@ -154,8 +190,15 @@ def create_app():
             return db.scalar(select(User).where(User.id == int(user_id)))
 
     register_views(app)
+    register_commands(app)
+    register_admission_control(app)
+    register_latency_budgets(app)
+    register_workloads(app)
+    register_blog_export(app)
+    register_feeds(app)
 
     @app.route('/')
+    @admission_exempt(anonymous_only=True)
     def index():
         from utilities.navbar_loader import get_navbar_context
         from views.content.listings import Listing
@@ -211,19 +254,51 @@ def create_app():
             **_context()
         )
 
+    @app.route('/healthz')
+    @admission_exempt()
+    def healthz():
+        # public: liveness only; load figures would help time an attack
+        return {"status": "ok"}
+
+    @app.route('/healthz/metrics')
+    @admission_exempt()  # still answers while requests are being shed
+    @login_required
+    @role_validation("ADMIN")
+    def healthz_metrics():
+        return {"status": "ok", "admission": ADMISSION.snapshot(), "pools": pool_metrics()}
+
     @app.route('/favicon.ico')
+    @admission_exempt()
     def favicon():
         return send_from_directory(app.static_folder, 'icons/icon.png', mimetype='image/png')
 
     @app.route('/manifest.json')
+    @admission_exempt()
     def manifest():
         return send_from_directory(app.static_folder, 'manifest.json')
 
     @app.route('/robots.txt')
+    @admission_exempt()
     def robots_txt():
         return send_from_directory(app.static_folder, 'robots.txt', mimetype='text/plain')
 
+    @app.route('/sitemap.xml')
+    @admission_exempt()
+    def sitemap_index():
+        from services.feeds import SITEMAP_INDEX_FILE, send_feed_file
+
+        return send_feed_file(SITEMAP_INDEX_FILE, 'application/xml')
+
+    @app.route('/sitemap-<any(pages, tags):name>.xml')
+    @app.route('/sitemap-posts-<int:block>.xml', defaults={'name': None})
+    @admission_exempt()
+    def sitemap_part(name: str | None, block: int | None = None):
+        from services.feeds import send_feed_file
+
+        return send_feed_file(f"sitemap-{name or f'posts-{block}'}.xml", 'application/xml')
+
     @app.route('/about-us')
+    @admission_exempt(anonymous_only=True)
     def about_us():
         return render_template(
             "about.html",
@@ -241,5 +316,5 @@ def create_app():
 if __name__ == "__main__":
     from services.chat import socketio
 
-    app = create_app()
+    app = create_app(auto_bootstrap=True)
     socketio.run(app, host='0.0.0.0', port=8080, debug=True)
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+Benchmark the blog markdown pipeline over a corpus of posts of varying size.
+
+    python -m benchmarks.markdown_render [--corpus DIR] [--repeat N]
+
+Without --corpus a synthetic corpus (1 KB .. 200 KB) is generated. Reports per-size
+timings for: the legacy per-call pipeline, the reusable pipeline (cold, no cache),
+the reusable pipeline without prettify, and a memoized (warm cache) hit.
+"""
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+import bleach
+import markdown
+from bleach.callbacks import nofollow
+from bs4 import BeautifulSoup
+
+from utilities.parsers.mdown import (
+    ALLOWED_ATTRS,
+    ALLOWED_PROTOCOLS,
+    ALLOWED_TAGS,
+    MARKDOWN_EXTENSIONS,
+    MarkdownRenderer,
+    split_front_matter,
+)
+
+FRONT_MATTER = "---\ntitle: Benchmark {i}\nslug: /bench-{i}\nauthor: bench@example.com\npublished_at: 2025-01-01\n---\n"
+SECTION = """
+## Breath and balance {n}
+
+Yoga is a **practice** of *attention*. Visit https://example.com/retreats/{n} for details,
+or read [the guide](https://example.com/guide-{n} "Guide").
+
+- Inhale for four counts
+- Hold for four counts
+- Exhale for six counts
+
+> The body benefits from movement, and the mind benefits from stillness.
+
+```python
+def breathe(count={n}):
+    return count * 2
+```
+"""
+
+
+def legacy_parse_markdown(md: str):
+    """The original implementation: fresh converter, two cleans, linkify, prettify per call."""
+    meta, body = split_front_matter(md)
+    raw_html = markdown.markdown(body, extensions=MARKDOWN_EXTENSIONS)
+    clean_html = bleach.clean(raw_html, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRS, strip=True,
+                              protocols=ALLOWED_PROTOCOLS)
+    clean_html = bleach.linkify(clean_html, callbacks=[nofollow])
+    pretty_html = BeautifulSoup(clean_html, "html.parser").prettify()
+    plain_text = bleach.clean(raw_html, tags=[], strip=True)
+    return meta, pretty_html, plain_text
+
+
+def synthetic_corpus() -> list[tuple[str, str]]:
+    corpus = []
+    for i, target_kb in enumerate((1, 5, 20, 50, 200)):
+        sections = []
+        n = 0
+        while sum(len(s) for s in sections) < target_kb * 1024:
+            sections.append(SECTION.format(n=n))
+            n += 1
+        corpus.append((f"{target_kb}KB", FRONT_MATTER.format(i=i) + "".join(sections)))
+    return corpus
+
+
+def load_corpus(directory: Path) -> list[tuple[str, str]]:
+    files = sorted(directory.glob("*.md"), key=lambda p: p.stat().st_size)
+    return [(f"{p.name} ({p.stat().st_size // 1024}KB)", p.read_text(encoding="utf-8")) for p in files]
+
+
+def _time(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", type=Path, help="directory of .md files (default: synthetic)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus()
+    uncached = MarkdownRenderer(cache_size=0)
+    cached = MarkdownRenderer()
+
+    header = f"{'post':<28}{'legacy ms':>12}{'pipeline ms':>14}{'no-pretty ms':>14}{'cached ms':>12}"
+    print(header)
+    print("-" * len(header))
+    for label, md in corpus:
+        cached.render(md)  # warm
+        print(
+            f"{label:<28}"
+            f"{_time(lambda: legacy_parse_markdown(md), args.repeat):>12.2f}"
+            f"{_time(lambda: uncached.render(md), args.repeat):>14.2f}"
+            f"{_time(lambda: uncached.render(md, prettify=False), args.repeat):>14.2f}"
+            f"{_time(lambda: cached.render(md), args.repeat):>12.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
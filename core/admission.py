@@ -0,0 +1,180 @@
+# core/admission.py
+from __future__ import annotations
+
+import math
+import threading
+import time
+from functools import wraps
+from typing import Optional
+
+from flask import Flask, g, request, session
+
+from utilities import LOGGER
+
+
+class AdmissionController:
+    """
+    Adaptive concurrency limit for DB-bound requests (AIMD on observed latency).
+
+    - try_acquire() never blocks: once `inflight >= limit` the request is shed.
+    - Every release feeds latency + pool wait back; the limit grows additively while
+      latency stays near the no-load baseline and shrinks multiplicatively when latency
+      exceeds `tolerance x baseline` or requests wait on the connection pool.
+    - Latency is judged per route (`key`, the endpoint): a 5 ms JSON call and a 100 ms page
+      render each compare against their own baseline, so a healthy mix never reads as congestion.
+    """
+
+    def __init__(
+            self,
+            *,
+            initial_limit: int = 20,
+            min_limit: int = 2,
+            max_limit: int = 200,
+            tolerance: float = 2.0,
+            pool_wait_threshold_s: float = 0.05,
+            backoff: float = 0.9,
+            smoothing: float = 0.2,
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.pool_wait_threshold_s = pool_wait_threshold_s
+        self.backoff = backoff
+        self.smoothing = smoothing
+
+        self.inflight = 0
+        self.rejected = 0
+        self.latency_ewma: Optional[float] = None  # all routes; only sizes Retry-After
+        # per key: [latency EWMA, baseline]
+        self._routes: dict[str, list[float]] = {}
+        self.pool_wait_ewma = 0.0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.inflight >= int(self.limit):
+                self.rejected += 1
+                return False
+            self.inflight += 1
+            return True
+
+    def release(self, latency_s: float, pool_wait_s: float = 0.0, *, key: str = "") -> None:
+        with self._lock:
+            self.inflight = max(self.inflight - 1, 0)
+            self._observe(latency_s, pool_wait_s, key)
+
+    def observe_pool_wait(self, wait_s: float) -> None:
+        with self._lock:
+            self.pool_wait_ewma += self.smoothing * (wait_s - self.pool_wait_ewma)
+
+    def _observe(self, latency_s: float, pool_wait_s: float, key: str = "") -> None:
+        if self.latency_ewma is None:
+            self.latency_ewma = latency_s
+        else:
+            self.latency_ewma += self.smoothing * (latency_s - self.latency_ewma)
+
+        route = self._routes.get(key)
+        if route is None:
+            route = self._routes[key] = [latency_s, latency_s]
+        else:
+            route[0] += self.smoothing * (latency_s - route[0])
+            # baseline tracks the route's fastest recent latency but drifts up slowly so it can recover
+            if latency_s < route[1]:
+                route[1] = latency_s
+            else:
+                route[1] += 0.01 * (latency_s - route[1])
+        route_ewma, baseline = route
+
+        congested = (
+                pool_wait_s > self.pool_wait_threshold_s
+                or route_ewma > self.tolerance * max(baseline, 1e-3)
+        )
+        if congested:
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+        else:
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+
+    def retry_after_s(self) -> int:
+        """Rough time until capacity frees up: one average request, at least a second."""
+        return max(1, math.ceil(self.latency_ewma or 1.0))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "limit": int(self.limit),
+                "inflight": self.inflight,
+                "rejected": self.rejected,
+                "latency_ewma_ms": round((self.latency_ewma or 0.0) * 1000, 1),
+                "routes": len(self._routes),
+                "pool_wait_ewma_ms": round(self.pool_wait_ewma * 1000, 1),
+            }
+
+
+ADMISSION = AdmissionController()
+
+
+def observe_pool_wait(wait_s: float) -> None:
+    """Called by core.db.uow() with the time spent checking out a pooled connection."""
+    ADMISSION.observe_pool_wait(wait_s)
+    try:
+        g.pool_wait_s = g.get("pool_wait_s", 0.0) + wait_s
+    except RuntimeError:  # outside an app context (CLI, socket handlers)
+        pass
+
+
+def admission_exempt(*, anonymous_only: bool = False):
+    """
+    Skip admission control for a route: health checks, or pages served from cache
+    to anonymous visitors (`anonymous_only=True`).
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            return f(*args, **kwargs)
+
+        decorated_function.admission_exempt = "anonymous" if anonymous_only else "always"
+        return decorated_function
+
+    return decorator
+
+
+def _is_exempt(app: Flask) -> bool:
+    if request.endpoint is None or request.endpoint == "static":
+        return True
+    view = app.view_functions.get(request.endpoint)
+    mode = getattr(view, "admission_exempt", None)
+    if mode == "always":
+        return True
+    # peek at the session instead of current_user: loading the user would hit the DB
+    return mode == "anonymous" and request.method in {"GET", "HEAD"} and "_user_id" not in session
+
+
+def register_admission_control(app: Flask, controller: AdmissionController = ADMISSION) -> None:
+    """Shed excess DB-bound requests with 503 + Retry-After instead of queueing on the pool."""
+
+    @app.before_request
+    def _admit():
+        if _is_exempt(app):
+            return None
+        if not controller.try_acquire():
+            retry_after = controller.retry_after_s()
+            LOGGER.warning(
+                "request_shed",
+                endpoint=request.endpoint,
+                path=request.path,
+                retry_after_s=retry_after,
+                **controller.snapshot(),
+            )
+            return "The service is busy. Please try again shortly.", 503, {"Retry-After": str(retry_after)}
+        g.admitted_at = time.monotonic()
+        return None
+
+    @app.teardown_request
+    def _release(_exc):
+        admitted_at = g.pop("admitted_at", None)
+        if admitted_at is not None:
+            controller.release(
+                time.monotonic() - admitted_at, g.pop("pool_wait_s", 0.0), key=request.endpoint or ""
+            )
@@ -0,0 +1,190 @@
+# core/cli.py
+from __future__ import annotations
+
+import click
+from flask import Flask
+
+
+def register_commands(app: Flask) -> None:
+    """
+    Attach deploy/maintenance commands to `flask --app app <command>`.
+    Keep this as the single entry point for CLI registration.
+    """
+
+    @app.cli.command("bootstrap-db")
+    @click.option("--force", is_flag=True, help="Run DDL even if the schema fingerprint matches.")
+    def bootstrap_db(force: bool) -> None:
+        """Create schemas/extensions/tables and seed enums (run once per deploy)."""
+        from core.db import init_db, uow, schema_fingerprint, schema_is_current, read_system_meta
+        from core.enum_seed import seed_enums, ENUM_SEED_HASH_KEY
+
+        system_meta = read_system_meta()
+        if force or not schema_is_current(system_meta):
+            init_db()
+            click.echo(f"Schema bootstrapped (fingerprint {schema_fingerprint()[:12]}).")
+        else:
+            click.echo("Schema fingerprint matches; skipping DDL.")
+
+        known_hash = None if force else system_meta.get(ENUM_SEED_HASH_KEY)
+        with uow(workload="background") as db:
+            seeded = seed_enums(db, known_hash=known_hash)
+        click.echo("Enumeration tables seeded." if seeded else "Enumeration seed hash matches; skipping.")
+
+    @app.cli.command("check-search-indexes")
+    @click.option("--term", default="yoga", show_default=True, help="Substring to plan the searches with.")
+    def check_search_indexes(term: str) -> None:
+        """EXPLAIN the admin substring searches and fail unless each one uses its trigram index."""
+        import json
+
+        from sqlalchemy import select, text
+
+        from core.db import uow
+        from models.sql import BlogPost, User
+        from models.yoga.base import YogaSchool
+        from services.blog import _apply_blog_search_filters
+        from services.user import _apply_admin_user_search_filter
+
+        checks = (
+            ("users.email", _apply_admin_user_search_filter(select(User.id), "email", term), {"ix_users_email_trgm"}),
+            ("blog_posts.title", _apply_blog_search_filters(select(BlogPost.id), term, "title"),
+             {"ix_blog_posts_title_trgm"}),
+            ("blog_posts.slug", _apply_blog_search_filters(select(BlogPost.id), term, "slug"),
+             {"ix_blog_posts_slug_trgm"}),
+            ("schools.name", select(YogaSchool.id).where(YogaSchool.name.ilike(f"%{term}%")),
+             {"ix_schools_name_trgm"}),
+        )
+
+        failed = False
+        with uow(readonly=True, workload="background") as db:
+            # small tables are cheaper to seq-scan; force the planner to show whether the index is usable
+            db.execute(text("SET LOCAL enable_seqscan = off"))
+            for label, stmt, expected in checks:
+                compiled = stmt.compile(db.get_bind(), compile_kwargs={"literal_binds": True})
+                plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+                plan_text = plan if isinstance(plan, str) else json.dumps(plan)
+                used = sorted(name for name in expected if name in plan_text)
+                if used:
+                    click.echo(f"ok    {label}: {', '.join(used)}")
+                else:
+                    failed = True
+                    click.echo(f"FAIL  {label}: none of {sorted(expected)} in plan")
+        if failed:
+            raise SystemExit(1)
+
+    @app.cli.command("export-blog")
+    @click.option("--workers", default=0, show_default=True, help="Render processes (0 = CPU count).")
+    def export_blog(workers: int) -> None:
+        """Re-render every published post and the blog index to BLOG_EXPORT_DIR for nginx."""
+        from services.blog_export import rebuild_exports
+
+        written, removed = rebuild_exports(app, workers=workers)
+        click.echo(f"Exported {written} post(s) and the index to {app.config['BLOG_EXPORT_DIR']}; pruned {removed}.")
+
+    @app.cli.command("import-blogs")
+    @click.argument("source", type=click.Path(exists=True))
+    @click.option("--workers", default=0, show_default=True, help="Parse processes (0 = CPU count).")
+    @click.option("--replace", is_flag=True, help="Rewrite posts whose slug exists with different content.")
+    @click.option("--batch-size", default=200, show_default=True, help="Posts written per transaction.")
+    def import_blogs(source: str, workers: int, replace: bool, batch_size: int) -> None:
+        """Bulk-import a directory or .zip of front-matter markdown posts (safe to re-run)."""
+        from services.blog_import import import_blogs as run_import
+
+        report = run_import(source, workers=workers, replace=replace, batch_size=batch_size)
+        for name, message in report.errors:
+            click.echo(f"error  {name}: {message}", err=True)
+        click.echo(
+            f"{len(report.created)} created, {len(report.updated)} updated, "
+            f"{len(report.unchanged)} unchanged, {len(report.errors)} failed."
+        )
+        if not report.ok:
+            raise SystemExit(1)
+
+    @app.cli.command("rerender-blogs")
+    @click.option("--workers", default=0, show_default=True, help="Render processes (0 = CPU count).")
+    @click.option("--batch-size", default=100, show_default=True, help="Posts read and written per transaction.")
+    @click.option("--pause", default=0.5, show_default=True, help="Seconds to sleep between batches.")
+    @click.option("--start-after", default=0, show_default=True, help="Resume after this post id.")
+    def rerender_blogs(workers: int, batch_size: int, pause: float, start_after: int) -> None:
+        """Re-render stored posts older than the current markdown renderer version (safe to re-run)."""
+        from services.blog_render import rerender_blogs as run_rerender
+        from utilities.parsers.mdown import RENDERER_VERSION
+
+        def progress(report) -> None:
+            click.echo(f"{report.rendered}/{report.total} re-rendered (last id {report.last_id})")
+
+        report = run_rerender(
+            workers=workers, batch_size=batch_size, pause=pause, start_after=start_after, progress=progress
+        )
+        for post_id, message in report.errors:
+            click.echo(f"error  post {post_id}: {message}", err=True)
+        click.echo(
+            f"{report.rendered} post(s) now at renderer version {RENDERER_VERSION}, {len(report.errors)} failed."
+        )
+        if report.errors:
+            raise SystemExit(1)
+
+    @app.cli.command("rebuild-tag-counts")
+    def rebuild_tag_counts_command() -> None:
+        """Recompute the blog tag rollup from published posts (repair; normally kept current)."""
+        from core.db import uow
+        from services.blog_tags import rebuild_tag_counts
+
+        with uow(workload="background") as db:
+            tags = rebuild_tag_counts(db)
+        click.echo(f"Tag rollup rebuilt: {tags} tag(s).")
+
+    @app.cli.command("recompute-related")
+    def recompute_related_command() -> None:
+        """Rebuild every post's "related reading" list from a fresh TF-IDF fit (nightly / after imports)."""
+        from core.db import uow
+        from services.blog_related import recompute_related
+
+        with uow(workload="background") as db:
+            written = recompute_related(db)
+        click.echo(f"Related posts computed for {written} post(s).")
+
+    @app.cli.command("compute-popularity")
+    @click.option("--half-life", type=float, default=None, help="Days for a view's weight to halve.")
+    @click.option("--window", type=int, default=None, help="Days of view history to score.")
+    def compute_popularity_command(half_life: float | None, window: int | None) -> None:
+        """Recompute decayed popularity scores from the per-day view counters (run periodically)."""
+        from core.db import uow
+        from services.blog_views import compute_popularity
+
+        options = {}
+        if half_life is not None:
+            options["half_life_days"] = half_life
+        if window is not None:
+            options["window_days"] = window
+        with uow(workload="background") as db:
+            scored = compute_popularity(db, **options)
+        click.echo(f"Popularity scored for {scored} post(s).")
+        if app.config.get("BLOG_STATIC_EXPORT"):
+            from services.blog_export import export_index
+
+            export_index(app)  # the exported index carries the "Most read" strip
+            click.echo("Exported blog index refreshed.")
+
+    @app.cli.command("build-feeds")
+    def build_feeds() -> None:
+        """Regenerate the RSS/Atom feeds and every sitemap file under FEEDS_DIR."""
+        from services.feeds import rebuild_feeds
+
+        blocks = rebuild_feeds(app)
+        click.echo(f"Feeds and sitemaps written to {app.config['FEEDS_DIR']} ({blocks} post block(s)).")
+
+    @app.cli.command("warm-images")
+    @click.argument("filenames", nargs=-1)
+    def warm_images(filenames: tuple[str, ...]) -> None:
+        """Pre-generate responsive derivatives for blog images (all of BLOG_IMAGE_DIR by default)."""
+        from utilities import images
+
+        names = filenames or sorted(p.name for p in images.BLOG_IMAGE_DIR.iterdir() if p.is_file())
+        total = 0
+        for name in names:
+            source = images.source_image(name)
+            if source is None:
+                click.echo(f"skipped {name}: not a readable image", err=True)
+                continue
+            total += images.warm(source)
+        click.echo(f"{total} derivative(s) ready in {images.IMAGE_CACHE_DIR} ({', '.join(images.supported_formats())}).")
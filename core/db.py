@@ -1,29 +1,131 @@
 # core/db.py
+import hashlib
+import time
 from contextlib import contextmanager
+from functools import lru_cache
 
 from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import ProgrammingError
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateColumn, CreateIndex, CreateTable
 
+import models.enum  # noqa: F401  (registers enum tables on Base.metadata)
 from models import Base
-from models.sql import ensure_postgres_extensions
-from utilities.connection import EngineManager
+from models.sql import ensure_postgres_extensions, SystemMeta
+from models.sql.base import POSTGRES_EXTENSIONS
+from core.admission import observe_pool_wait
+from core.deadline import timeout_settings
+from core.workload import current_workload, observe_checkout
+from utilities.connection import EngineManager, DEFAULT_WORKLOAD
 
 ENGINE = EngineManager.get('BODHGRIHA')
 SessionLocal = sessionmaker(bind=ENGINE, expire_on_commit=False, autoflush=False)
 
+_SESSION_FACTORIES: dict[str, sessionmaker] = {DEFAULT_WORKLOAD: SessionLocal}
+
+SCHEMAS = [
+    'core',
+    'courses',
+    'registrations',
+    'payments',
+    'admin',
+    'auth',
+    # 'audit',
+    # 'notifications',
+    # 'reports',
+    # 'analytics',
+    'content',
+]
+
+SCHEMA_FINGERPRINT_KEY = 'schema_fingerprint'
+
+
+def _upgrade_weighted_search_tsv(conn) -> None:
+    """PG16 cannot ALTER a generated expression: rebuild blog_posts.search_tsv once if it predates title weights."""
+    from models.sql import BlogPost
+
+    current = conn.execute(text(
+        "SELECT pg_get_expr(d.adbin, d.adrelid) FROM pg_attrdef d "
+        "JOIN pg_attribute a ON a.attrelid = d.adrelid AND a.attnum = d.adnum "
+        "WHERE d.adrelid = 'content.blog_posts'::regclass AND a.attname = 'search_tsv'"
+    )).scalar()
+    if current is None or 'setweight' in current:
+        return
+    column = CreateColumn(BlogPost.__table__.c.search_tsv).compile(dialect=conn.dialect)
+    conn.execute(text("ALTER TABLE content.blog_posts DROP COLUMN search_tsv"))
+    conn.execute(text(f"ALTER TABLE content.blog_posts ADD COLUMN {column}"))
+
+
+def _backfill_blog_tag_counts(conn) -> None:
+    """Fill the tag rollup from existing posts; later changes keep it current incrementally."""
+    from services.blog_tags import rebuild_tag_counts
+
+    rebuild_tag_counts(conn)
+
+
+# Non-additive changes create_all() cannot express on existing tables. Each must be idempotent;
+# they run before _sync_additive(), which then recreates any indexes they dropped.
+SCHEMA_UPGRADES = [
+    _upgrade_weighted_search_tsv,
+    _backfill_blog_tag_counts,
+]
+
 
 def get_session():
     return SessionLocal()
 
 
+def _session_factory(workload_name: str) -> sessionmaker:
+    factory = _SESSION_FACTORIES.get(workload_name)
+    if factory is None:
+        factory = sessionmaker(
+            bind=EngineManager.for_workload(workload_name), expire_on_commit=False, autoflush=False
+        )
+        _SESSION_FACTORIES[workload_name] = factory
+    return factory
+
+
+def _apply_timeouts(db) -> None:
+    """
+    Bound this transaction by the remaining request budget (core.deadline).
+    set_config(..., true) is transaction-local, so pooled connections are not affected.
+    """
+    settings = timeout_settings()
+    if settings is None:
+        return
+    statement_ms, lock_ms = settings
+    db.execute(
+        text("SELECT set_config('statement_timeout', :statement_ms, true), "
+             "set_config('lock_timeout', :lock_ms, true)"),
+        {"statement_ms": f"{statement_ms}ms", "lock_ms": f"{lock_ms}ms"},
+    )
+
+
+def _checkout(db, workload_name: str) -> None:
+    """Acquire the pooled connection up front so pool wait time feeds admission control."""
+    started = time.monotonic()
+    db.connection()
+    waited = time.monotonic() - started
+    observe_pool_wait(waited)
+    observe_checkout(workload_name, waited)
+
+
 @contextmanager
-def uow(readonly: bool = False):
-    db = SessionLocal()
+def uow(readonly: bool = False, workload: str | None = None):
+    """
+    Transaction scope. `workload` picks the connection pool (see utilities.connection.WORKLOADS);
+    by default the class declared for the current request or core.workload.workload() block.
+    """
+    workload_name = workload or current_workload()
+    db = _session_factory(workload_name)()
     try:
         if readonly:
             trans = db.begin()
             try:
+                _checkout(db, workload_name)
                 db.execute(text("SET TRANSACTION READ ONLY"))
+                _apply_timeouts(db)
                 yield db
                 trans.commit()  # ✅ commit, not rollback
             except:
@@ -31,6 +133,8 @@ def uow(readonly: bool = False):
                 raise
         else:
             with db.begin():
+                _checkout(db, workload_name)
+                _apply_timeouts(db)
                 yield db
     except:
         if db.in_transaction():
@@ -40,28 +144,82 @@ def uow(readonly: bool = False):
         db.close()
 
 
+@lru_cache(maxsize=1)
+def schema_fingerprint() -> str:
+    """
+    sha256 over the DDL the models would emit (tables + indexes), schemas and extensions.
+    Pure Python; never touches the database.
+    """
+    dialect = postgresql.dialect()
+    digest = hashlib.sha256()
+    digest.update(",".join(SCHEMAS).encode())
+    digest.update(",".join(POSTGRES_EXTENSIONS).encode())
+    digest.update(",".join(upgrade.__name__ for upgrade in SCHEMA_UPGRADES).encode())
+    for table in sorted(Base.metadata.tables.values(), key=lambda t: t.fullname):
+        digest.update(str(CreateTable(table).compile(dialect=dialect)).encode())
+        for index in sorted(table.indexes, key=lambda ix: ix.name or ""):
+            digest.update(str(CreateIndex(index).compile(dialect=dialect)).encode())
+    return digest.hexdigest()
+
+
+def read_system_meta() -> dict[str, str]:
+    """
+    Load all bootstrap bookkeeping rows in a single query.
+    Returns {} when the table does not exist yet (fresh database).
+    """
+    try:
+        with ENGINE.connect() as conn:
+            rows = conn.execute(text("SELECT key, value FROM core.system_meta"))
+            return {key: value for key, value in rows}
+    except ProgrammingError:
+        return {}
+
+
+def write_system_meta(conn, key: str, value: str) -> None:
+    conn.execute(
+        postgresql.insert(SystemMeta)
+        .values(key=key, value=value)
+        .on_conflict_do_update(
+            index_elements=[SystemMeta.key],
+            set_={"value": value, "updated_at": text("now()")},
+        )
+    )
+
+
+def schema_is_current(meta: dict[str, str] | None = None) -> bool:
+    meta = read_system_meta() if meta is None else meta
+    return meta.get(SCHEMA_FINGERPRINT_KEY) == schema_fingerprint()
+
+
+def _sync_additive(conn) -> None:
+    """
+    create_all() only creates missing tables. Add missing columns and indexes to existing
+    ones so new model fields reach old databases (new NOT NULL columns need a server_default).
+    """
+    existing = {
+        (schema, table, column)
+        for schema, table, column in conn.execute(text(
+            "SELECT table_schema, table_name, column_name FROM information_schema.columns "
+            "WHERE table_schema = ANY(:schemas)"
+        ), {"schemas": SCHEMAS})
+    }
+    for table in Base.metadata.sorted_tables:
+        for column in table.columns:
+            if (table.schema, table.name, column.name) in existing:
+                continue
+            ddl = CreateColumn(column).compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE {table.fullname} ADD COLUMN IF NOT EXISTS {ddl}"))
+        for index in table.indexes:
+            conn.execute(CreateIndex(index, if_not_exists=True))
+
+
 def init_db() -> None:
     """
     Dev/test convenience: create extensions and tables.
     Do NOT call in production. Use Alembic instead.
+    Records the schema fingerprint so later boots can skip this entirely.
     """
-    # create schemas
-    from sqlalchemy import text
-
     with ENGINE.connect() as conn:
-        SCHEMAS = [
-            'core',
-            'courses',
-            'registrations',
-            'payments',
-            'admin',
-            'auth',
-            # 'audit',
-            # 'notifications',
-            # 'reports',
-            # 'analytics',
-            'content',
-        ]
         for schema in SCHEMAS:
             conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema};"))
 
@@ -69,3 +227,9 @@ def init_db() -> None:
 
     ensure_postgres_extensions(ENGINE)
     Base.metadata.create_all(ENGINE)
+
+    with ENGINE.begin() as conn:
+        for upgrade in SCHEMA_UPGRADES:
+            upgrade(conn)
+        _sync_additive(conn)
+        write_system_meta(conn, SCHEMA_FINGERPRINT_KEY, schema_fingerprint())
@@ -0,0 +1,167 @@
+# core/deadline.py
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Optional
+
+from flask import Flask, g, request
+from sqlalchemy.exc import DBAPIError
+
+from utilities import LOGGER
+
+# absolute monotonic deadline for the current request/task (None = unbounded)
+_DEADLINE: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+_LOCK_TIMEOUT_MS: ContextVar[Optional[int]] = ContextVar("lock_timeout_ms", default=None)
+
+DEFAULT_BUDGET_MS = 5000
+
+# Postgres SQLSTATEs raised by statement_timeout / lock_timeout
+PG_QUERY_CANCELED = "57014"
+PG_LOCK_NOT_AVAILABLE = "55P03"
+
+
+class DeadlineExceeded(Exception):
+    """Raised when the request budget is spent before (or while) doing DB work."""
+
+
+def remaining_ms() -> Optional[int]:
+    """Milliseconds left in the current budget, or None when no budget applies."""
+    deadline_at = _DEADLINE.get()
+    if deadline_at is None:
+        return None
+    return int((deadline_at - time.monotonic()) * 1000)
+
+
+def lock_timeout_ms() -> Optional[int]:
+    return _LOCK_TIMEOUT_MS.get()
+
+
+@contextmanager
+def deadline(budget_ms: int, *, lock_ms: Optional[int] = None):
+    """
+    Narrow the current deadline for nested work. Budgets only ever shrink:
+    a nested call cannot outlive the request that started it.
+    """
+    candidate = time.monotonic() + budget_ms / 1000
+    current = _DEADLINE.get()
+    token = _DEADLINE.set(candidate if current is None else min(current, candidate))
+    lock_token = _LOCK_TIMEOUT_MS.set(lock_ms) if lock_ms is not None else None
+    try:
+        yield
+    finally:
+        _DEADLINE.reset(token)
+        if lock_token is not None:
+            _LOCK_TIMEOUT_MS.reset(lock_token)
+
+
+def latency_budget(budget_ms: int, *, lock_ms: Optional[int] = None):
+    """Per-route override, read by the before_request hook registered in register_latency_budgets()."""
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            return f(*args, **kwargs)
+
+        decorated_function.latency_budget = (budget_ms, lock_ms)
+        return decorated_function
+
+    return decorator
+
+
+def timeout_settings() -> Optional[tuple[int, int]]:
+    """
+    (statement_timeout_ms, lock_timeout_ms) for the next transaction, derived from the
+    remaining budget. Raises DeadlineExceeded when nothing is left.
+    """
+    left = remaining_ms()
+    if left is None:
+        return None
+    if left <= 0:
+        raise DeadlineExceeded("request deadline exceeded before database work")
+    lock_ms = lock_timeout_ms()
+    return left, min(lock_ms, left) if lock_ms is not None else left
+
+
+def _resolve_budget(app: Flask) -> tuple[int, Optional[int]]:
+    view = app.view_functions.get(request.endpoint) if request.endpoint else None
+    if view is not None and hasattr(view, "latency_budget"):
+        return view.latency_budget
+
+    budgets = app.config.get("LATENCY_BUDGETS", {})
+    for key in (request.endpoint, request.blueprint):
+        if key and key in budgets:
+            return budgets[key], None
+    return app.config.get("DEFAULT_LATENCY_BUDGET_MS", DEFAULT_BUDGET_MS), None
+
+
+def _pgcode(error: DBAPIError) -> Optional[str]:
+    orig = getattr(error, "orig", None)
+    return getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+
+
+def register_latency_budgets(app: Flask) -> None:
+    """
+    Give every request a latency budget (per route, blueprint or default) and map
+    timeouts to clean 503/504 responses with structured logs.
+    """
+    app.config.setdefault("DEFAULT_LATENCY_BUDGET_MS", DEFAULT_BUDGET_MS)
+    app.config.setdefault(
+        "LATENCY_BUDGETS",
+        {
+            # endpoint or blueprint name -> budget in ms
+            "static": 1000,
+            "blog": 2000,
+            "chat": 2000,
+            "admin_users": 4000,
+            "schools": 4000,
+        },
+    )
+
+    @app.before_request
+    def _start_deadline():
+        budget_ms, lock_ms = _resolve_budget(app)
+        g.latency_budget_ms = budget_ms
+        g.request_started_at = time.monotonic()
+        g.deadline_tokens = (
+            _DEADLINE.set(g.request_started_at + budget_ms / 1000),
+            _LOCK_TIMEOUT_MS.set(lock_ms),
+        )
+
+    @app.teardown_request
+    def _clear_deadline(_exc):
+        tokens = g.pop("deadline_tokens", None)
+        if tokens:
+            _DEADLINE.reset(tokens[0])
+            _LOCK_TIMEOUT_MS.reset(tokens[1])
+
+    def _log(event: str, status: int, error: Exception):
+        started = g.get("request_started_at")
+        LOGGER.warning(
+            event,
+            status=status,
+            endpoint=request.endpoint,
+            path=request.path,
+            method=request.method,
+            budget_ms=g.get("latency_budget_ms"),
+            elapsed_ms=int((time.monotonic() - started) * 1000) if started else None,
+            error=str(error).splitlines()[0] if str(error) else error.__class__.__name__,
+        )
+
+    @app.errorhandler(DeadlineExceeded)
+    def _deadline_exceeded(error):
+        _log("request_deadline_exceeded", 504, error)
+        return "The request took too long. Please try again.", 504
+
+    @app.errorhandler(DBAPIError)
+    def _database_timeout(error):
+        code = _pgcode(error)
+        if code == PG_QUERY_CANCELED:
+            _log("statement_timeout", 504, error)
+            return "The request took too long. Please try again.", 504
+        if code == PG_LOCK_NOT_AVAILABLE:
+            _log("lock_timeout", 503, error)
+            return "The service is busy. Please try again.", 503, {"Retry-After": "1"}
+        raise error
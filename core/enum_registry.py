@@ -0,0 +1,138 @@
+# core/enum_registry.py
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Iterator, Mapping, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from core.enum_seed import ENUM_SEEDS
+
+
+def _registry_name(model) -> str:
+    """CourseType -> course_type, ExperienceLevel -> experience_level."""
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", model.__name__).lower()
+
+
+@dataclass(frozen=True, slots=True)
+class EnumEntry:
+    """Immutable snapshot of one enum row; `attrs` keeps table-specific columns (symbol, hours_required, ...)."""
+
+    id: int
+    code: str
+    label: str
+    description: Optional[str] = None
+    sort_order: int = 0
+    is_active: bool = True
+    attrs: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+
+    def __getattr__(self, item: str) -> Any:
+        try:
+            return self.attrs[item]
+        except KeyError:
+            raise AttributeError(item) from None
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> "EnumEntry":
+        return cls(
+            id=row["id"],
+            code=row["code"],
+            label=row.get("label") or row.get("name") or row["code"],
+            description=row.get("description"),
+            sort_order=row.get("sort_order") or 0,
+            is_active=row.get("is_active") is not False,
+            attrs=MappingProxyType(dict(row)),
+        )
+
+
+class EnumTable:
+    """Read-only code→entry and id→entry maps for a single enum table."""
+
+    __slots__ = ("name", "by_code", "by_id", "_ordered")
+
+    def __init__(self, name: str, entries: list[EnumEntry]):
+        self.name = name
+        self._ordered = tuple(sorted(entries, key=lambda e: (e.sort_order, e.label)))
+        self.by_code = MappingProxyType({e.code: e for e in self._ordered})
+        self.by_id = MappingProxyType({e.id: e for e in self._ordered})
+
+    def get(self, code: str | None) -> Optional[EnumEntry]:
+        return self.by_code.get(code) if code is not None else None
+
+    def from_id(self, entry_id: int | None) -> Optional[EnumEntry]:
+        return self.by_id.get(entry_id) if entry_id is not None else None
+
+    def choices(self, *, active_only: bool = True, key: str = "code") -> list[tuple[Any, str]]:
+        """(value, label) pairs ready for WTForms SelectField choices."""
+        return [(getattr(e, key), e.label) for e in self._ordered if e.is_active or not active_only]
+
+    def __iter__(self) -> Iterator[EnumEntry]:
+        return iter(self._ordered)
+
+    def __len__(self) -> int:
+        return len(self._ordered)
+
+
+class EnumRegistry:
+    """
+    Process-wide, immutable view of all enum tables.
+    Loaded once at startup (single UNION ALL query); lookups never touch the database.
+    A reload swaps the whole snapshot atomically, so readers never see a partial state.
+    """
+
+    def __init__(self):
+        self._tables: Mapping[str, EnumTable] = MappingProxyType({})
+        self._lock = threading.Lock()
+        self.fingerprint: Optional[str] = None
+
+    @staticmethod
+    def _load_query():
+        parts = [
+            f"SELECT '{_registry_name(model)}' AS name, to_jsonb(t) AS row FROM {model.__table__.fullname} t"
+            for model, _ in ENUM_SEEDS
+        ]
+        return text(" UNION ALL ".join(parts))
+
+    def load(self, db: Session, *, fingerprint: Optional[str] = None) -> "EnumRegistry":
+        grouped: dict[str, list[EnumEntry]] = {_registry_name(model): [] for model, _ in ENUM_SEEDS}
+        for name, row in db.execute(self._load_query()):
+            grouped[name].append(EnumEntry.from_row(row))
+
+        tables = MappingProxyType({name: EnumTable(name, entries) for name, entries in grouped.items()})
+        with self._lock:
+            self._tables = tables
+            self.fingerprint = fingerprint
+        return self
+
+    def reload_if_changed(self, db: Session, fingerprint: str) -> bool:
+        """Reload hook: refresh the snapshot only when the seed fingerprint moved."""
+        if self.fingerprint == fingerprint and self._tables:
+            return False
+        self.load(db, fingerprint=fingerprint)
+        return True
+
+    @property
+    def loaded(self) -> bool:
+        return bool(self._tables)
+
+    def table(self, model_or_name) -> EnumTable:
+        name = model_or_name if isinstance(model_or_name, str) else _registry_name(model_or_name)
+        try:
+            return self._tables[name]
+        except KeyError:
+            raise LookupError(f"enum table not loaded: {name}") from None
+
+    def __getattr__(self, item: str) -> EnumTable:
+        if item.startswith("_"):
+            raise AttributeError(item)
+        try:
+            return self.table(item)
+        except LookupError as exc:
+            raise AttributeError(item) from exc
+
+
+ENUMS = EnumRegistry()
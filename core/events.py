@@ -0,0 +1,58 @@
+# core/events.py
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from utilities import LOGGER
+
+BLOG_CHANGED = "blog.changed"
+# one event per bulk import batch (post_ids, slugs) instead of one BLOG_CHANGED per post
+BLOG_IMPORTED = "blog.imported"
+# stored HTML regenerated by the re-render job (post_ids, slugs); content and metadata unchanged
+BLOG_RERENDERED = "blog.rerendered"
+
+_PENDING_KEY = "pending_events"
+_LISTENERS: dict[str, list[Callable[..., None]]] = defaultdict(list)
+
+
+def subscribe(name: str):
+    """Register `fn(**payload)` for events named `name` (decorator)."""
+
+    def decorator(fn):
+        _LISTENERS[name].append(fn)
+        return fn
+
+    return decorator
+
+
+def emit(db: Session, name: str, **payload: Any) -> None:
+    """
+    Queue an event on the session. Listeners run only after the transaction commits,
+    so a rolled-back change never invalidates caches or rewrites files.
+    """
+    db.info.setdefault(_PENDING_KEY, []).append((name, payload))
+
+
+def dispatch(name: str, **payload: Any) -> None:
+    for listener in list(_LISTENERS.get(name, ())):
+        try:
+            listener(**payload)
+        except Exception:
+            # a broken cache hook must never fail the request that already committed
+            LOGGER.exception("event_listener_failed", event=name, listener=getattr(listener, "__name__", listener))
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_after_commit(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    for name, payload in pending or ():
+        dispatch(name, **payload)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,81 @@
+# core/http_cache.py
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import urllib.request
+from datetime import datetime
+from typing import Iterable, Optional
+
+from flask import Response, session
+
+from core.events import BLOG_CHANGED, BLOG_IMPORTED, BLOG_RERENDERED, subscribe
+from utilities import LOGGER
+
+# shared caches (CDN / nginx proxy_cache) may hold anonymous blog pages this long;
+# browsers always revalidate, which the ETag pre-check answers with a 304
+BLOG_SHARED_MAX_AGE_S = int(os.environ.get("BLOG_SHARED_MAX_AGE_S", "300"))
+# bump to invalidate every validator at once (e.g. after a template change)
+BLOG_ETAG_SALT = os.environ.get("BLOG_ETAG_SALT", "1")
+# base URL that accepts `PURGE <path>` (nginx cache_purge, Varnish); unset disables purging
+CACHE_PURGE_URL = os.environ.get("CACHE_PURGE_URL", "").rstrip("/")
+
+
+def viewer_key() -> str:
+    """Pages embed the navbar's login state, so validators differ per viewer."""
+    user_id = session.get("_user_id")
+    return f"u{user_id}" if user_id else "anon"
+
+
+def blog_post_etag(post_id: int, updated_at: Optional[datetime], viewer: str) -> str:
+    stamp = updated_at.isoformat() if updated_at else ""
+    raw = f"{post_id}:{stamp}:{viewer}:{BLOG_ETAG_SALT}".encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()[:20]
+
+
+def apply_cache_headers(response: Response, *, etag: str, last_modified: Optional[datetime], viewer: str) -> Response:
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    if viewer == "anon":
+        response.cache_control.public = True
+        response.cache_control.s_maxage = BLOG_SHARED_MAX_AGE_S
+    else:
+        response.cache_control.private = True
+    response.cache_control.max_age = 0
+    response.cache_control.must_revalidate = True
+    response.vary.add("Cookie")
+    return response
+
+
+def blog_post_path(slug: str) -> str:
+    return "/blog/" + slug.lstrip("/")
+
+
+def purge(paths: Iterable[str]) -> None:
+    """Ask the shared cache to drop `paths` (fire-and-forget; failures are only logged)."""
+    if not CACHE_PURGE_URL:
+        return
+    paths = list(paths)
+
+    def _send():
+        for path in paths:
+            request = urllib.request.Request(CACHE_PURGE_URL + path, method="PURGE")
+            try:
+                urllib.request.urlopen(request, timeout=2).close()
+            except Exception as exc:  # 404 = nothing cached, also fine
+                LOGGER.info("cache_purge_failed", path=path, error=str(exc))
+
+    threading.Thread(target=_send, name="cache-purge", daemon=True).start()
+
+
+@subscribe(BLOG_CHANGED)
+def _purge_blog_post(*, slug: str, **_payload) -> None:
+    purge((blog_post_path(slug), "/blog/"))
+
+
+@subscribe(BLOG_IMPORTED)
+@subscribe(BLOG_RERENDERED)
+def _purge_imported_posts(*, slugs: list[str], **_payload) -> None:
+    purge([*(blog_post_path(slug) for slug in slugs), "/blog/"])
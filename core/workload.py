@@ -0,0 +1,101 @@
+# core/workload.py
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from flask import Flask, g, request
+
+from utilities.connection import DEFAULT_WORKLOAD, WORKLOADS, EngineManager
+
+_WORKLOAD: ContextVar[str] = ContextVar("db_workload", default=DEFAULT_WORKLOAD)
+
+# checkout wait per workload class (EWMA, seconds), fed by core.db.uow()
+_POOL_WAITS: dict[str, float] = {}
+_POOL_WAITS_LOCK = threading.Lock()
+
+
+def current_workload() -> str:
+    return _WORKLOAD.get()
+
+
+@contextmanager
+def workload(name: str):
+    """Route every uow() opened inside this block to the `name` pool (service calls, jobs)."""
+    if name not in WORKLOADS:
+        raise KeyError(f"unknown workload class: {name}")
+    token = _WORKLOAD.set(name)
+    try:
+        yield
+    finally:
+        _WORKLOAD.reset(token)
+
+
+def workload_class(name: str):
+    """Per-route declaration, read by the before_request hook registered in register_workloads()."""
+    if name not in WORKLOADS:
+        raise KeyError(f"unknown workload class: {name}")
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            return f(*args, **kwargs)
+
+        decorated_function.workload_class = name
+        return decorated_function
+
+    return decorator
+
+
+def observe_checkout(name: str, wait_s: float, smoothing: float = 0.2) -> None:
+    with _POOL_WAITS_LOCK:
+        previous = _POOL_WAITS.get(name, wait_s)
+        _POOL_WAITS[name] = previous + smoothing * (wait_s - previous)
+
+
+def pool_metrics() -> dict[str, dict]:
+    """Pool gauges plus checkout wait per workload class."""
+    metrics = EngineManager.pool_stats()
+    with _POOL_WAITS_LOCK:
+        for name, wait_s in _POOL_WAITS.items():
+            metrics.setdefault(name, {})["checkout_wait_ewma_ms"] = round(wait_s * 1000, 2)
+    return metrics
+
+
+def _resolve_workload(app: Flask) -> str:
+    view = app.view_functions.get(request.endpoint) if request.endpoint else None
+    if view is not None and hasattr(view, "workload_class"):
+        return view.workload_class
+
+    classes = app.config.get("WORKLOAD_CLASSES", {})
+    for key in (request.endpoint, request.blueprint):
+        if key and key in classes:
+            return classes[key]
+    return DEFAULT_WORKLOAD
+
+
+def register_workloads(app: Flask) -> None:
+    """Pick the workload class (and therefore connection pool) for each request."""
+    app.config.setdefault(
+        "WORKLOAD_CLASSES",
+        {
+            # endpoint or blueprint name -> workload class
+            "admin_users": "admin",
+            "schools.school_dashboard": "admin",
+            "schools.update_school": "admin",
+            "blog.dashboard": "admin",
+            "blog.upload": "admin",
+        },
+    )
+
+    @app.before_request
+    def _select_workload():
+        g.workload_token = _WORKLOAD.set(_resolve_workload(app))
+
+    @app.teardown_request
+    def _reset_workload(_exc):
+        token = g.pop("workload_token", None)
+        if token is not None:
+            _WORKLOAD.reset(token)
@@ -37,6 +37,7 @@ class BlogDashboardFilters(BaseModel):
     query: Optional[str] = None
     page: int = 1
     per_page: int = 10
+    cursor: Optional[str] = None
 
     @validator("field", pre=True, always=True)
     def normalize_field(cls, value: Optional[str]) -> str:
@@ -73,18 +74,29 @@ class BlogDashboardFilters(BaseModel):
     def offset(self) -> int:
         return (self.page - 1) * self.per_page
 
+    @property
+    def uses_keyset(self) -> bool:
+        """
+        Unfiltered listings page by cursor; searches keep numbered pages (similarity order).
+        """
+        return self.normalized_query is None
+
 
 class BlogPaginationView(BaseModel):
     """
     Provides pagination metadata to render dashboard controls.
     """
 
-    total_count: int = 0
+    total_count: Optional[int] = 0
     page: int = 1
     per_page: int = 10
+    # set when total_count is None (count skipped): whether a row exists past this page
+    has_more: bool = False
 
     @property
     def total_pages(self) -> int:
+        if self.total_count is None:
+            return self.page + 1 if self.has_more else self.page
         if self.total_count == 0:
             return 1
         return ((self.total_count - 1) // self.per_page) + 1
@@ -97,6 +109,8 @@ class BlogPaginationView(BaseModel):
         """
         Return a copy with the page number clamped within valid bounds.
         """
+        if self.total_count is None:
+            return self
         page = self.page
         if self.total_pages == 0:
             page = 1
@@ -105,7 +119,7 @@ class BlogPaginationView(BaseModel):
         return self.copy(update={"page": page})
 
     def range_indices(self, current_page_count: int) -> tuple[int, int]:
-        if current_page_count == 0 or self.total_count == 0:
+        if current_page_count == 0:
             return 0, 0
         start = (self.page - 1) * self.per_page + 1
         end = start + current_page_count - 1
@@ -17,6 +17,10 @@ from .testimonials import Testimonial, TestimonialMeta
 
 from .chat import Message
 
+from .system import SystemMeta
+
+from .blog import BlogTagCount, BlogRelated, BlogPostViews, BlogPopularity
+
 __all__ = [
     "User",
     "BlogPost",
@@ -33,5 +37,10 @@ __all__ = [
     "Testimonial",
     "TestimonialMeta",
     "Message",
-    "Avatar"
+    "Avatar",
+    "SystemMeta",
+    "BlogTagCount",
+    "BlogRelated",
+    "BlogPostViews",
+    "BlogPopularity",
 ]
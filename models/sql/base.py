@@ -9,7 +9,7 @@ from enum import Enum
 
 from sqlalchemy import (
     BigInteger, String, Boolean, DateTime, ForeignKey,
-    Index, UniqueConstraint, text, func, Enum as SQLEnum
+    Index, UniqueConstraint, text, func, cast, Enum as SQLEnum
 )
 from sqlalchemy.dialects.postgresql import CITEXT, JSONB, INET, UUID, ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship, deferred
@@ -80,6 +80,15 @@ class User(UserMixin, TimestampMixin, Base):
 
     __table_args__ = (
         Index("ix_users_active", "is_active"),
+        # keyset pagination for the admin dashboard: (created_at desc, id desc)
+        Index("ix_users_created_at_id", "created_at", "id"),
+        # trigram index for admin substring search; citext has no trgm opclass, so index email::text
+        Index(
+            "ix_users_email_trgm",
+            cast(email, Text).label("email_text"),
+            postgresql_using="gin",
+            postgresql_ops={"email_text": "gin_trgm_ops"},
+        ),
         dict(
             schema="auth",
             comment="User accounts with roles, 2FA, sessions, tokens, and related info",
@@ -348,10 +357,17 @@ class BlogPost(TimestampMixin, Base):
     slug: Mapped[str] = mapped_column(String(200), nullable=False)
     title: Mapped[str] = mapped_column(String(300), nullable=False)
 
-    # content
-    body_md: Mapped[str] = mapped_column(Text, nullable=True)  # source markdown
-    body_html: Mapped[str] = mapped_column(Text, nullable=False)  # sanitized render
-    body_text: Mapped[str] = mapped_column(Text, nullable=False)  # stripped for search
+    # content; the large columns only load when asked for (undefer()) so listings stay light
+    body_md: Mapped[str] = mapped_column(Text, nullable=True, deferred=True, deferred_raiseload=True)  # source markdown
+    body_html: Mapped[str] = mapped_column(
+        Text, nullable=False, deferred=True, deferred_raiseload=True
+    )  # sanitized render
+    body_text: Mapped[str] = mapped_column(
+        Text, nullable=False, deferred=True, deferred_raiseload=True
+    )  # stripped for search
+
+    # utilities.parsers.mdown.RENDERER_VERSION that produced body_html/body_text; older rows are stale
+    render_version: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
 
     # arbitrary metadata from front matter (tags, hero_image, reading_time, etc.)
     meta: Mapped[Dict[str, Any]] = mapped_column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))
@@ -364,11 +380,19 @@ class BlogPost(TimestampMixin, Base):
     author_id: Mapped[int] = mapped_column(ForeignKey("auth.users.id", ondelete="SET NULL"), nullable=True)
     author: Mapped[Optional[User]] = relationship(back_populates="posts")
 
-    # Postgres generated column for full-text search
+    # Postgres generated column for full-text search; title (A) outranks body (B) in ts_rank_cd
     search_tsv: Mapped[str] = mapped_column(
         TSVECTOR,
-        Computed(text("to_tsvector('english', body_text)"), persisted=True),  # PG16 supports persisted generated
+        Computed(
+            text(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english', body_text), 'B')"
+            ),
+            persisted=True,
+        ),  # PG16 supports persisted generated
         nullable=False,
+        deferred=True,
+        deferred_raiseload=True,
     )
 
     __table_args__ = (
@@ -378,6 +402,17 @@ class BlogPost(TimestampMixin, Base):
         Index("ix_blog_posts_search_tsv", search_tsv, postgresql_using="gin"),
         # quick listings
         Index("ix_blog_posts_published", "is_published", "published_at"),
+        # keyset pagination for the dashboard; NULL published_at (drafts) sorts last in desc
+        Index(
+            "ix_blog_posts_published_keyset",
+            func.coalesce(published_at, text("'-infinity'::timestamptz")),
+            "id",
+        ),
+        # re-render job: outdated rows in id order
+        Index("ix_blog_posts_render_version", "render_version", "id"),
+        # trigram indexes for dashboard substring search (ILIKE '%q%') and similarity ranking
+        Index("ix_blog_posts_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_blog_posts_slug_trgm", "slug", postgresql_using="gin", postgresql_ops={"slug": "gin_trgm_ops"}),
         CheckConstraint("char_length(slug) >= 3", name="slug_min_len"),
         dict(
             schema="content",
@@ -389,7 +424,20 @@ class BlogPost(TimestampMixin, Base):
         return f"<BlogPost id={self.id} slug={self.slug!r} published={self.is_published}>"
 
 
+# tag pages filter with meta->'tags' @> '["tag"]'; jsonb_path_ops supports exactly that and is smaller
+Index(
+    "ix_blog_posts_tags",
+    BlogPost.meta["tags"].label("tags"),
+    postgresql_using="gin",
+    postgresql_ops={"tags": "jsonb_path_ops"},
+)
+
+
 # ---------- Bootstrap helpers (extensions, etc.)
+# tsvector is built-in; no extension needed for basic English config
+POSTGRES_EXTENSIONS = ("citext", "unaccent", "pg_trgm")
+
+
 def ensure_postgres_extensions(bind) -> None:
     """
     Create required PG extensions if missing.
@@ -397,11 +445,8 @@ def ensure_postgres_extensions(bind) -> None:
     """
     from sqlalchemy import text as sql_text
     with bind.begin() as conn:
-        conn.execute(sql_text("CREATE EXTENSION IF NOT EXISTS citext"))
-        # tsvector is built-in; no extension needed for basic English config
-        # If you use unaccent or pg_trgm later:
-        conn.execute(sql_text("CREATE EXTENSION IF NOT EXISTS unaccent"))
-        conn.execute(sql_text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        for extension in POSTGRES_EXTENSIONS:
+            conn.execute(sql_text(f"CREATE EXTENSION IF NOT EXISTS {extension}"))
 
 
 # ---------- Optional: materialized convenience for search (example)
@@ -0,0 +1,106 @@
+# blog.py
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from sqlalchemy import BigInteger, Date, DateTime, Float, ForeignKey, Index, Integer, String, func
+from sqlalchemy.dialects.postgresql import ARRAY, REAL
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models import Base
+
+
+class BlogTagCount(Base):
+    """
+    Published-post count per tag, kept in step with BlogPost.meta['tags'] by services.blog_tags
+    inside the same transaction as each publish/unpublish/delete; tags at zero are deleted.
+    The tag cloud reads only this table.
+    """
+
+    __tablename__ = "blog_tag_counts"
+
+    tag: Mapped[str] = mapped_column(String(100), primary_key=True)
+    post_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    # bumped whenever the set of published posts carrying the tag changes ("more in this tag" validators)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        dict(
+            schema="content",
+            comment="Rollup: number of published blog posts per tag",
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return f"<BlogTagCount tag={self.tag!r} posts={self.post_count}>"
+
+
+class BlogRelated(Base):
+    """
+    Precomputed "related reading" for one published post: the ids of its top-k TF-IDF cosine
+    neighbours, best first, with their scores. Written by services.blog_related; the post page
+    reads one row by primary key.
+    """
+
+    __tablename__ = "blog_related"
+
+    post_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey("content.blog_posts.id", ondelete="CASCADE"), primary_key=True
+    )
+    related_ids: Mapped[list[int]] = mapped_column(ARRAY(BigInteger), nullable=False)
+    scores: Mapped[list[float]] = mapped_column(ARRAY(REAL), nullable=False)
+    computed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        dict(
+            schema="content",
+            comment="Top-k TF-IDF related posts per published blog post",
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return f"<BlogRelated post_id={self.post_id} related={self.related_ids}>"
+
+
+class BlogPostViews(Base):
+    """
+    Reads per post per day. Rows are only ever incremented in aggregated batches flushed by
+    services.blog_views, never once per request.
+    """
+
+    __tablename__ = "blog_post_views"
+
+    post_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey("content.blog_posts.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    views: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        # popularity job scans a recent window of days
+        Index("ix_blog_post_views_day", "day"),
+        dict(
+            schema="content",
+            comment="Daily read counts per blog post",
+        ),
+    )
+
+
+class BlogPopularity(Base):
+    """Time-decayed read score per post, recomputed periodically from blog_post_views."""
+
+    __tablename__ = "blog_popularity"
+
+    post_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey("content.blog_posts.id", ondelete="CASCADE"), primary_key=True
+    )
+    score: Mapped[float] = mapped_column(Float, nullable=False)
+    computed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_blog_popularity_score", "score"),
+        dict(
+            schema="content",
+            comment="Decayed popularity score per blog post (most read lists)",
+        ),
+    )
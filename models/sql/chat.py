@@ -9,6 +9,7 @@ from sqlalchemy import (
     String,
     Text,
     Boolean,
+    Computed,
     DateTime,
     ForeignKey,
     CheckConstraint,
@@ -28,13 +29,6 @@ from typing import Optional, List
 
 class Message(Base, TimestampMixin):
     __tablename__ = "messages"
-    __table_args__ = (
-        # Helpful indexes and table metadata
-        dict(
-            schema="content",
-            comment="User-to-user messages",
-        ),
-    )
 
     id = mapped_column(BigInteger, primary_key=True)
     sender_id = mapped_column(Integer, ForeignKey("auth.users.id"), nullable=False)
@@ -44,5 +38,26 @@ class Message(Base, TimestampMixin):
     sent_at = mapped_column(DateTime(timezone=True), nullable=False, server_default=text("now()"))
     read_at = mapped_column(DateTime(timezone=True), nullable=True)
 
+    # conversation key: the ordered user pair, the same whichever way a message went;
+    # generated, so existing rows are filled when the columns are added
+    user_lo = mapped_column(Integer, Computed("least(sender_id, receiver_id)", persisted=True), nullable=False)
+    user_hi = mapped_column(Integer, Computed("greatest(sender_id, receiver_id)", persisted=True), nullable=False)
+
+    __table_args__ = (
+        # one conversation's history, newest first: an index range scan per page
+        Index("ix_messages_conversation", user_lo, user_hi, sent_at.desc(), id.desc()),
+        # "who have I talked to": lookups by the high side (the index above covers the low side)
+        Index("ix_messages_user_hi", user_hi, user_lo),
+        dict(
+            schema="content",
+            comment="User-to-user messages",
+        ),
+    )
+
+    @classmethod
+    def between(cls, user_id: int, other_id: int):
+        """WHERE clause for the conversation of two users (a user with themself included)."""
+        return (cls.user_lo == min(user_id, other_id)) & (cls.user_hi == max(user_id, other_id))
+
     sender = relationship("User", foreign_keys=[sender_id], backref="sent_messages")
     receiver = relationship("User", foreign_keys=[receiver_id], backref="received_messages")
@@ -0,0 +1,37 @@
+# system.py
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import String, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models import Base
+
+
+class SystemMeta(Base):
+    """
+    Tiny key/value table for bootstrap bookkeeping (schema fingerprint, seed hashes).
+    Read once at startup so workers can skip DDL when nothing changed.
+    """
+
+    __tablename__ = "system_meta"
+
+    key: Mapped[str] = mapped_column(String(100), primary_key=True)
+    value: Mapped[str] = mapped_column(String(255), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        dict(
+            schema="core",
+            comment="Bootstrap bookkeeping: schema fingerprint, seed hashes",
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return f"<SystemMeta key={self.key!r} value={self.value!r}>"
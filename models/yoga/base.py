@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Numeric, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Numeric, ForeignKey, Table, Index
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from models import Base
 
 
@@ -15,9 +15,6 @@ Instructors = Table(
 
 class YogaSchool(Base):
     __tablename__ = 'schools'
-    __table_args__ = dict(
-        schema="admin"
-    )
 
     id = Column(Integer, primary_key=True)
     owner_id = Column(Integer, ForeignKey('auth.users.id'), nullable=False)  # User who owns/manages the school
@@ -39,6 +36,16 @@ class YogaSchool(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = (
+        # trigram index for dashboard substring search (ILIKE '%q%') and similarity ranking
+        Index("ix_schools_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        # keyset pagination for the dashboard; NULL created_at sorts last in desc
+        Index("ix_schools_created_at_keyset", func.coalesce(created_at, text("'-infinity'::timestamptz")), "id"),
+        dict(
+            schema="admin"
+        ),
+    )
+
     # Relationships
     owner = relationship("User", foreign_keys=[owner_id])
     locations = relationship("Location", back_populates="school", cascade="all, delete-orphan")
@@ -194,14 +201,46 @@ class Course(Base):
     # Relationships
     school = relationship("YogaSchool", back_populates="courses")
     location = relationship("Location", back_populates="courses")
-    course_type_rel = relationship("CourseType")
-    style_rel = relationship("Style")
-    level_rel = relationship("ExperienceLevel")
-    certification_level_rel = relationship("CertificationLevel")
-    currency_rel = relationship("Currency")
-    status_rel = relationship("CourseStatus")
+    # Enum relationships are kept for explicit joins/eager loads but never lazy-load per row;
+    # use the *_entry properties below, which resolve from the in-memory enum registry.
+    course_type_rel = relationship("CourseType", lazy="raise_on_sql")
+    style_rel = relationship("Style", lazy="raise_on_sql")
+    level_rel = relationship("ExperienceLevel", lazy="raise_on_sql")
+    certification_level_rel = relationship("CertificationLevel", lazy="raise_on_sql")
+    currency_rel = relationship("Currency", lazy="raise_on_sql")
+    status_rel = relationship("CourseStatus", lazy="raise_on_sql")
     instructors = relationship("User", secondary=Instructors, backref="courses_teaching")
 
+    @property
+    def course_type_entry(self):
+        from core.enum_registry import ENUMS
+        return ENUMS.course_type.from_id(self.course_type)
+
+    @property
+    def style_entry(self):
+        from core.enum_registry import ENUMS
+        return ENUMS.style.from_id(self.style)
+
+    @property
+    def level_entry(self):
+        from core.enum_registry import ENUMS
+        return ENUMS.experience_level.from_id(self.level)
+
+    @property
+    def certification_level_entry(self):
+        from core.enum_registry import ENUMS
+        return ENUMS.certification_level.from_id(self.certification_level)
+
+    @property
+    def currency_entry(self):
+        from core.enum_registry import ENUMS
+        return ENUMS.currency.from_id(self.currency)
+
+    @property
+    def status_entry(self):
+        from core.enum_registry import ENUMS
+        return ENUMS.course_status.from_id(self.status)
+
     @property
     def available_spots(self):
         return self.max_students - self.current_registrations
@@ -1,17 +1,71 @@
 # services/blog_service.py
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Optional, Sequence
 
-from sqlalchemy import select, func, or_
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import select, func, or_, cast, literal_column, tuple_
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION
+from sqlalchemy.orm import Session, selectinload, undefer
 from sqlalchemy.exc import IntegrityError
 
+from core.db import uow
+from core.events import BLOG_CHANGED, emit
 from models.sql.base import BlogPost, User
-from utilities.parsers.mdown import parse_markdown
+from models.sql.blog import BlogRelated
+from utilities.cache import TTLCache
+from utilities.pagination import encode_cursor, decode_cursor, Keyset, KeysetPage, SortKey, TIMESTAMPTZ_NULLS_LAST
+from utilities.parsers.mdown import RENDERER_VERSION, parse_markdown
+from services.blog_slugs import slug_candidates
+from services.blog_tags import adjust_tag_counts, tag_deltas
+from services.counts import RowCount, count_rows, invalidate_counts
 from services.user import _resolve_user
 
+# ts_rank_cd weights for {D, C, B, A}: search_tsv stores the title as A and the body as B
+SEARCH_RANK_WEIGHTS = literal_column("'{0.1, 0.2, 0.4, 1.0}'::float4[]")
+SEARCH_HEADLINE_OPTIONS = 'MaxFragments=2, MinWords=8, MaxWords=30, FragmentDelimiter=" … ", StartSel=<mark>, StopSel=</mark>'
+SEARCH_MAX_QUERY_LENGTH = 200
+_SEARCH_CACHE = TTLCache(maxsize=512, ttl=30)
+BLOG_CARD_EXCERPT_CHARS = 220
+# listing order (published_at desc nulls last, id desc); served by ix_blog_posts_published_keyset
+BLOG_KEYSET = Keyset(
+    (SortKey("published_at", BlogPost.published_at, nulls_as=TIMESTAMPTZ_NULLS_LAST), SortKey("id", BlogPost.id))
+)
+
+
+@dataclass(slots=True, frozen=True)
+class BlogSearchHit:
+    id: int
+    slug: str
+    title: str
+    published_at: Optional[datetime]
+    description: Optional[str]
+    hero_image: Optional[str]
+    rank: float
+    snippet: str
+
+
+@dataclass(slots=True, frozen=True)
+class BlogCard:
+    """What a blog index card renders; loaded without the body columns."""
+    id: int
+    slug: str
+    title: str
+    published_at: Optional[datetime]
+    excerpt: str
+    hero_image: Optional[str]
+    reading_time: Optional[str]
+    tags: tuple[str, ...]
+    author_name: Optional[str]
+
+
+@dataclass(slots=True, frozen=True)
+class BlogSearchPage:
+    query: str
+    hits: tuple[BlogSearchHit, ...]
+    next_cursor: Optional[str]
+
 
 def register_blog(
         db: Session,
@@ -26,8 +80,8 @@ def register_blog(
     - Enforces unique slug (case-insensitive)
     - Sets is_published / published_at based on meta.draft and meta.published_at
     """
-    # Enforce unique slug (case-insensitive) up front
-    exists = db.scalar(select(BlogPost.id).where(func.lower(BlogPost.slug) == slug.lower()))
+    # Enforce unique slug (case- and leading-slash-insensitive, as URLs resolve them) up front
+    exists = db.scalar(select(BlogPost.id).where(func.lower(BlogPost.slug).in_(slug_candidates(slug))))
     if exists:
         raise ValueError("slug_exists")
 
@@ -48,6 +102,7 @@ def register_blog(
         body_md=body_md,
         body_html=body_html,
         body_text=body_text,
+        render_version=RENDERER_VERSION,
         meta=meta,
         is_published=is_published,
         published_at=published_at,
@@ -61,6 +116,9 @@ def register_blog(
         # race on unique index
         raise ValueError("slug_exists") from ie
 
+    adjust_tag_counts(db, tag_deltas(after=[(post.is_published, post.meta)]))
+    invalidate_counts(BlogPost)
+    emit(db, BLOG_CHANGED, post_id=post.id, slug=post.slug, action="created")
     return post
 
 
@@ -84,6 +142,19 @@ def _apply_blog_search_filters(statement, search: Optional[str], search_field: O
     )
 
 
+def _blog_search_similarity(search: Optional[str], search_field: Optional[str]):
+    """pg_trgm similarity of the searched column(s), for best-match-first ordering."""
+    if not search:
+        return None
+
+    normalized_field = (search_field or "title").strip().lower()
+    if normalized_field == "slug":
+        return func.similarity(BlogPost.slug, search)
+    if normalized_field == "title":
+        return func.similarity(BlogPost.title, search)
+    return func.greatest(func.similarity(BlogPost.title, search), func.similarity(BlogPost.slug, search))
+
+
 def get_all_blogs(
     db: Session,
     *,
@@ -97,10 +168,13 @@ def get_all_blogs(
     Retrieve blog posts, newest first.
     Set published_only=False to include drafts.
     """
-    stmt = select(BlogPost).options(selectinload(BlogPost.author))
+    stmt = select(BlogPost).options(selectinload(BlogPost.author), undefer(BlogPost.body_text))
     if published_only:
         stmt = stmt.where(BlogPost.is_published.is_(True))
     stmt = _apply_blog_search_filters(stmt, search, search_field)
+    similarity = _blog_search_similarity(search, search_field)
+    if similarity is not None:
+        stmt = stmt.order_by(similarity.desc())
     stmt = stmt.order_by(BlogPost.published_at.desc().nullslast(), BlogPost.id.desc())
     if offset:
         stmt = stmt.offset(offset)
@@ -109,6 +183,27 @@ def get_all_blogs(
     return list(db.scalars(stmt))
 
 
+def page_blogs(
+    db: Session,
+    *,
+    published_only: bool = True,
+    cursor: Optional[str] = None,
+    limit: int = 10,
+    search: Optional[str] = None,
+    search_field: Optional[str] = None,
+    total: Optional[int] = None,
+) -> KeysetPage:
+    """
+    Keyset-paginated variant of get_all_blogs (newest first, drafts last).
+    Pass `total` to carry a count the caller already has; none is computed here.
+    """
+    stmt = select(BlogPost).options(selectinload(BlogPost.author), undefer(BlogPost.body_text))
+    if published_only:
+        stmt = stmt.where(BlogPost.is_published.is_(True))
+    stmt = _apply_blog_search_filters(stmt, search, search_field)
+    return BLOG_KEYSET.paginate(db, stmt, cursor=cursor, limit=limit, total=total)
+
+
 def count_blogs(
     db: Session,
     *,
@@ -123,14 +218,134 @@ def count_blogs(
     return db.scalar(stmt) or 0
 
 
+def _blog_card_select():
+    """Column projection for BlogCard rows (no body columns), author joined for the byline."""
+    author_name = func.nullif(func.trim(func.concat_ws(" ", User.first_name, User.last_name)), "")
+    return (
+        select(
+            BlogPost.id,
+            BlogPost.slug,
+            BlogPost.title,
+            BlogPost.published_at,
+            func.left(
+                func.coalesce(BlogPost.meta["description"].astext, BlogPost.body_text), BLOG_CARD_EXCERPT_CHARS
+            ).label("excerpt"),
+            BlogPost.meta["hero_image"].astext.label("hero_image"),
+            BlogPost.meta["reading_time"].astext.label("reading_time"),
+            BlogPost.meta["tags"].label("tags"),
+            func.coalesce(author_name, BlogPost.meta["author"].astext).label("author_name"),
+        )
+        .join(User, User.id == BlogPost.author_id, isouter=True)
+        .where(BlogPost.is_published.is_(True))
+    )
+
+
+def _blog_card(row) -> BlogCard:
+    return BlogCard(
+        id=row.id,
+        slug=row.slug,
+        title=row.title,
+        published_at=row.published_at,
+        excerpt=row.excerpt or "",
+        hero_image=row.hero_image,
+        reading_time=row.reading_time,
+        tags=tuple(row.tags or ())[:3] if isinstance(row.tags, list) else (),
+        author_name=row.author_name,
+    )
+
+
+def _has_tag(tag: str):
+    # meta->'tags' @> '["tag"]', served by ix_blog_posts_tags (GIN, jsonb_path_ops)
+    return BlogPost.meta["tags"].contains([tag])
+
+
+def page_blog_cards(
+    db: Session,
+    *,
+    cursor: Optional[str] = None,
+    limit: int = 12,
+    tag: Optional[str] = None,
+) -> KeysetPage:
+    """
+    Published posts as BlogCard rows, newest first, keyset-paginated; only those tagged
+    `tag` when given.
+
+    A column projection: the excerpt is cut in SQL and only meta fields the card shows are
+    extracted, so body_md/body_html/search_tsv never leave the database and the cost of a
+    page does not grow with the archive.
+    """
+    stmt = _blog_card_select()
+    if tag is not None:
+        stmt = stmt.where(_has_tag(tag))
+    page = BLOG_KEYSET.paginate(db, stmt, cursor=cursor, limit=limit, scalars=False)
+    page.items = [_blog_card(row) for row in page.items]
+    return page
+
+
+def more_in_tag(db: Session, *, tag: str, exclude_ids: Sequence[int], limit: int = 3) -> list[BlogCard]:
+    """Newest other published posts sharing `tag` ("more in this tag" under a post)."""
+    stmt = (
+        _blog_card_select()
+        .where(_has_tag(tag), BlogPost.id.not_in(list(exclude_ids)))
+        .order_by(BlogPost.published_at.desc().nullslast(), BlogPost.id.desc())
+        .limit(limit)
+    )
+    return [_blog_card(row) for row in db.execute(stmt)]
+
+
+def related_cards(db: Session, *, post_id: int) -> list[BlogCard]:
+    """
+    "Related reading" for a post from the precomputed content.blog_related row (see
+    services.blog_related): one primary-key lookup unnested and joined to the cards, best first.
+    """
+    ranked = (
+        select(
+            func.unnest(BlogRelated.related_ids).label("id"),
+            func.generate_subscripts(BlogRelated.related_ids, 1).label("rank"),
+        )
+        .where(BlogRelated.post_id == post_id)
+        .subquery("ranked")
+    )
+    stmt = _blog_card_select().join(ranked, ranked.c.id == BlogPost.id).order_by(ranked.c.rank)
+    return [_blog_card(row) for row in db.execute(stmt)]
+
+
+def dashboard_count_blogs(
+    db: Session,
+    *,
+    published_only: bool = False,
+    search: Optional[str] = None,
+    search_field: Optional[str] = None,
+) -> Optional[RowCount]:
+    """
+    count_blogs for dashboard headers: TTL-cached per filter, estimated when unfiltered
+    and large, None when a filtered count would be too expensive (see services.counts).
+    """
+    stmt = select(func.count()).select_from(BlogPost)
+    if published_only:
+        stmt = stmt.where(BlogPost.is_published.is_(True))
+    stmt = _apply_blog_search_filters(stmt, search, search_field)
+    field = (search_field or "title").strip().lower() if search else None
+    return count_rows(
+        db,
+        BlogPost,
+        stmt,
+        key=(published_only, search, field),
+        filtered=bool(search) or published_only,
+    )
+
+
 def delete_blog_by_id(db: Session, blog_id: int) -> None:
     """
     Delete a blog post by its ID.
     """
     post = db.get(BlogPost, blog_id)
     if post:
+        adjust_tag_counts(db, tag_deltas(before=[(post.is_published, post.meta)]))
         db.delete(post)
         db.flush()  # apply deletion without committing
+        invalidate_counts(BlogPost)
+        emit(db, BLOG_CHANGED, post_id=blog_id, slug=post.slug, action="deleted")
     else:
         raise ValueError("Blog post not found.")
 
@@ -143,11 +358,14 @@ def publish_blog(db: Session, blog_id: int) -> BlogPost:
     if not post:
         raise ValueError("Blog post not found.")
 
+    if not post.is_published:
+        adjust_tag_counts(db, tag_deltas(after=[(True, post.meta)]))
     post.is_published = True
     if not post.published_at:
         post.published_at = datetime.now(timezone.utc)
 
     db.flush()
+    emit(db, BLOG_CHANGED, post_id=post.id, slug=post.slug, action="published")
     return post
 
 
@@ -159,8 +377,94 @@ def unpublish_blog(db: Session, blog_id: int) -> BlogPost:
     if not post:
         raise ValueError("Blog post not found.")
 
+    if post.is_published:
+        adjust_tag_counts(db, tag_deltas(before=[(True, post.meta)]))
     post.is_published = False
     post.published_at = None
 
     db.flush()
+    emit(db, BLOG_CHANGED, post_id=post.id, slug=post.slug, action="unpublished")
     return post
+
+
+def normalize_search_query(query: Optional[str]) -> str:
+    """Collapse whitespace and case so equivalent queries share a cache entry."""
+    return " ".join((query or "").split()).lower()[:SEARCH_MAX_QUERY_LENGTH]
+
+
+def search_published_blogs(
+        db: Session,
+        query: str,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 10,
+) -> BlogSearchPage:
+    """
+    Ranked full-text search over published posts (GIN on search_tsv, no sequential scan).
+
+    - Ranking: ts_rank_cd with title (A) weighted above body (B)
+    - Keyset pagination on (rank desc, id desc) with an opaque cursor
+    - ts_headline snippets are computed only for the returned page
+    """
+    normalized = normalize_search_query(query)
+    if not normalized:
+        return BlogSearchPage(query="", hits=(), next_cursor=None)
+
+    ts_query = func.websearch_to_tsquery("english", normalized)
+    # float8 so the cursor round-trips exactly through JSON
+    rank = cast(func.ts_rank_cd(SEARCH_RANK_WEIGHTS, BlogPost.search_tsv, ts_query), DOUBLE_PRECISION)
+
+    ranked = (
+        select(BlogPost.id.label("id"), rank.label("rank"))
+        .where(BlogPost.is_published.is_(True))
+        .where(BlogPost.search_tsv.op("@@")(ts_query))
+        .subquery("ranked")
+    )
+    page_stmt = select(ranked.c.id, ranked.c.rank)
+    after = decode_cursor(cursor)
+    if after and {"rank", "id"} <= after.keys():
+        page_stmt = page_stmt.where(tuple_(ranked.c.rank, ranked.c.id) < tuple_(after["rank"], after["id"]))
+    page = (
+        page_stmt.order_by(ranked.c.rank.desc(), ranked.c.id.desc())
+        .limit(limit + 1)
+        .subquery("page")
+    )
+
+    rows = db.execute(
+        select(
+            BlogPost.id,
+            BlogPost.slug,
+            BlogPost.title,
+            BlogPost.published_at,
+            BlogPost.meta["description"].astext.label("description"),
+            BlogPost.meta["hero_image"].astext.label("hero_image"),
+            page.c.rank,
+            func.ts_headline("english", BlogPost.body_text, ts_query, SEARCH_HEADLINE_OPTIONS).label("snippet"),
+        )
+        .join(page, page.c.id == BlogPost.id)
+        .order_by(page.c.rank.desc(), page.c.id.desc())
+    ).all()
+
+    hits = tuple(BlogSearchHit(**row._mapping) for row in rows[:limit])
+    next_cursor = None
+    if len(rows) > limit:
+        last = hits[-1]
+        next_cursor = encode_cursor({"rank": last.rank, "id": last.id})
+    return BlogSearchPage(query=normalized, hits=hits, next_cursor=next_cursor)
+
+
+def search_blogs_cached(query: Optional[str], *, cursor: Optional[str] = None, limit: int = 10) -> BlogSearchPage:
+    """
+    search_published_blogs() behind a short-TTL cache keyed by the normalized query,
+    so popular searches do not even check out a connection.
+    """
+    normalized = normalize_search_query(query)
+    key = (normalized, cursor or "", limit)
+    cached = _SEARCH_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    with uow(readonly=True) as db:
+        result = search_published_blogs(db, normalized, cursor=cursor, limit=limit)
+    _SEARCH_CACHE.set(key, result)
+    return result
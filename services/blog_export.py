@@ -0,0 +1,235 @@
+# services/blog_export.py
+from __future__ import annotations
+
+import atexit
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from flask import Flask, current_app, has_app_context
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from core.events import BLOG_CHANGED, BLOG_IMPORTED, BLOG_RERENDERED, subscribe
+from core.http_cache import blog_post_path
+from models.sql.base import BlogPost
+from utilities import LOGGER
+from utilities.fs import atomic_write, remove_file
+
+BLOG_INDEX_PATH = "/blog/"
+# WSGI environ flag on the exporter's own requests (no HTTP header can set a dotted key),
+# so views can tell a pre-render from a reader, e.g. to leave view counts alone
+EXPORT_RENDER_ENVIRON_KEY = "bodhgriha.export_render"
+
+_WORKER_APP: Optional[Flask] = None
+
+
+def register_blog_export(app: Flask) -> None:
+    """
+    Static-export mode: published posts and the blog index are rendered to
+    BLOG_EXPORT_DIR whenever a post changes, and nginx serves them without Flask
+    (see nginx/default.conf). Off unless BLOG_STATIC_EXPORT is set.
+    """
+    app.config.setdefault(
+        "BLOG_STATIC_EXPORT", os.environ.get("BLOG_STATIC_EXPORT", "false").lower() in {"1", "true", "yes"}
+    )
+    app.config.setdefault("BLOG_EXPORT_DIR", os.environ.get("BLOG_EXPORT_DIR", "static_export"))
+    # public origin the exported pages are rendered for (canonical, og:url, JSON-LD url)
+    app.config.setdefault("SITE_URL", os.environ.get("SITE_URL", "https://bodhgriha.com").rstrip("/"))
+
+
+def export_root(app: Flask) -> Path:
+    return Path(app.config["BLOG_EXPORT_DIR"])
+
+
+def post_export_path(root: Path, slug: str) -> Path:
+    # nginx: try_files $uri.html -> /blog/<slug>.html
+    return root / "blog" / f"{slug.strip('/')}.html"
+
+
+def index_export_path(root: Path) -> Path:
+    # nginx: try_files ${uri}index.html -> /blog/index.html
+    return root / "blog" / "index.html"
+
+
+def _render(app: Flask, path: str) -> Optional[str]:
+    """
+    Render `path` as an anonymous visitor of SITE_URL would get it (the request-derived
+    absolute URLs included). None when the page is gone (404, or a redirect for drafts);
+    raises on server errors (e.g. a shed 503) so the existing file is kept.
+    """
+    with app.test_client() as client:
+        response = client.get(
+            path, base_url=app.config["SITE_URL"], environ_base={EXPORT_RENDER_ENVIRON_KEY: True}
+        )
+    if response.status_code >= 500:
+        raise RuntimeError(f"rendering {path} failed with HTTP {response.status_code}")
+    if response.status_code != 200:
+        return None
+    return response.get_data(as_text=True)
+
+
+def export_post(app: Flask, slug: str) -> bool:
+    """Write the post's page, or remove it when the post is not (or no longer) published."""
+    target = post_export_path(export_root(app), slug)
+    try:
+        html = _render(app, blog_post_path(slug))
+    except RuntimeError:
+        LOGGER.exception("blog_export_render_failed", slug=slug)
+        return False
+    if html is None:
+        remove_file(target)
+        return False
+    atomic_write(target, html)
+    return True
+
+
+def export_index(app: Flask) -> None:
+    try:
+        html = _render(app, BLOG_INDEX_PATH)
+    except RuntimeError:
+        LOGGER.exception("blog_export_render_failed", path=BLOG_INDEX_PATH)
+        return
+    target = index_export_path(export_root(app))
+    if html is None:
+        remove_file(target)
+    else:
+        atomic_write(target, html)
+
+
+def published_slugs(db: Session) -> list[str]:
+    return list(db.scalars(select(BlogPost.slug).where(BlogPost.is_published.is_(True)).order_by(BlogPost.id)))
+
+
+def prune_exports(app: Flask, keep_slugs: Iterable[str]) -> int:
+    """Remove exported post pages whose slug is not in `keep_slugs`."""
+    root = export_root(app)
+    keep = {post_export_path(root, slug) for slug in keep_slugs}
+    keep.add(index_export_path(root))
+    removed = 0
+    for path in (root / "blog").glob("**/*.html"):
+        if path not in keep and remove_file(path):
+            removed += 1
+    return removed
+
+
+class _ExportQueue:
+    """
+    One background thread per process running export jobs in order. Event listeners fire
+    inside the committing request; rendering there through the test client would nest a
+    request in the same app context and share its `g` (admission slot, deadline and
+    workload tokens). From this thread each render gets an app context of its own.
+    """
+
+    def __init__(self):
+        self._jobs: "queue.Queue[Callable[[], None]]" = queue.Queue()
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def submit(self, job: Callable[[], None]) -> None:
+        pid = os.getpid()
+        if self._pid != pid:
+            with self._lock:
+                if self._pid != pid:
+                    self._jobs = queue.Queue()  # a forked worker starts with its own queue and thread
+                    self._pid = pid
+                    threading.Thread(target=self._run, name="blog-export", daemon=True).start()
+        self._jobs.put(job)
+
+    def _run(self) -> None:
+        jobs = self._jobs
+        while True:
+            job = jobs.get()
+            try:
+                job()
+            except Exception:
+                LOGGER.exception("blog_export_job_failed")
+            finally:
+                jobs.task_done()
+
+    def drain(self) -> None:
+        """Wait for queued exports (CLI commands exit right after emitting their events)."""
+        if self._pid == os.getpid():
+            self._jobs.join()
+
+
+EXPORTS = _ExportQueue()
+atexit.register(EXPORTS.drain)
+
+
+def _export_app() -> Optional[Flask]:
+    if not has_app_context() or not current_app.config.get("BLOG_STATIC_EXPORT"):
+        return None
+    return current_app._get_current_object()
+
+
+@subscribe(BLOG_CHANGED)
+def _export_on_change(*, slug: str, action: str, **_payload) -> None:
+    app = _export_app()
+    if app is None:
+        return
+
+    def job():
+        if action in {"deleted", "unpublished"}:
+            remove_file(post_export_path(export_root(app), slug))
+        else:
+            export_post(app, slug)  # drafts render as a redirect and are removed
+        export_index(app)
+
+    EXPORTS.submit(job)
+
+
+@subscribe(BLOG_IMPORTED)
+@subscribe(BLOG_RERENDERED)
+def _export_on_import(*, slugs: list[str], **_payload) -> None:
+    app = _export_app()
+    if app is None:
+        return
+
+    def job():
+        for slug in slugs:
+            export_post(app, slug)
+        export_index(app)  # once per batch, not once per post
+
+    EXPORTS.submit(job)
+
+
+def _init_worker() -> None:
+    global _WORKER_APP
+    from app import create_app
+
+    _WORKER_APP = create_app(auto_bootstrap=False)
+
+
+def _export_in_worker(slug: str) -> bool:
+    return export_post(_WORKER_APP, slug)
+
+
+def rebuild_exports(app: Flask, *, workers: int = 0) -> tuple[int, int]:
+    """
+    Render every published post in `workers` processes (0 = CPU count), then the index,
+    then prune pages of posts that are gone. Returns (written, removed).
+    """
+    from core.db import uow
+
+    with uow(readonly=True, workload="background") as db:
+        slugs = published_slugs(db)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(slugs) < 2:
+        written = sum(export_post(app, slug) for slug in slugs)
+    else:
+        # spawn: each worker builds its own app and connection pools instead of inheriting sockets
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker) as pool:
+            chunksize = max(1, len(slugs) // (workers * 4))
+            written = sum(pool.map(_export_in_worker, slugs, chunksize=chunksize))
+
+    export_index(app)
+    removed = prune_exports(app, slugs)
+    LOGGER.info("blog_export_rebuilt", written=written, removed=removed, workers=workers)
+    return written, removed
@@ -0,0 +1,264 @@
+# services/blog_import.py
+from __future__ import annotations
+
+import hashlib
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator, Optional, Union
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from core.events import BLOG_IMPORTED, emit
+from models.sql.base import BlogPost
+from services.blog_slugs import slug_candidates, slug_key
+from services.blog_tags import adjust_tag_counts, tag_deltas
+from services.counts import invalidate_counts
+from services.user import _resolve_users
+from utilities import LOGGER
+from utilities.parsers.mdown import RENDERER_VERSION, parse_markdown
+
+MARKDOWN_SUFFIXES = (".md", ".markdown")
+# front-matter key the import stores its content hash under; re-imports compare against it
+CONTENT_HASH_KEY = "content_sha256"
+IMPORT_BATCH_SIZE = 200
+
+
+@dataclass(slots=True)
+class ParsedPost:
+    """A markdown file rendered by a worker, ready to become a blog_posts row."""
+    source: str
+    slug: str
+    title: str
+    body_md: str
+    body_html: str
+    body_text: str
+    meta: dict[str, Any]
+    is_published: bool
+    published_at: Optional[datetime]
+    author_email: Optional[str]
+    content_hash: str
+
+
+@dataclass
+class ImportReport:
+    created: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    errors: list[tuple[str, str]] = field(default_factory=list)  # (source file, message)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def iter_sources(path: Union[str, Path]) -> Iterator[tuple[str, str]]:
+    """Yield (name, markdown) for every markdown file in a directory tree or a .zip archive."""
+    path = Path(path)
+    if path.is_dir():
+        for file in sorted(path.rglob("*")):
+            if file.is_file() and file.suffix.lower() in MARKDOWN_SUFFIXES:
+                yield str(file.relative_to(path)), file.read_text("utf-8", errors="replace")
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in sorted(archive.infolist(), key=lambda i: i.filename):
+                name = info.filename
+                if info.is_dir() or not name.lower().endswith(MARKDOWN_SUFFIXES) or "__MACOSX/" in name:
+                    continue
+                yield name, archive.read(info).decode("utf-8", errors="replace")
+    else:
+        raise ValueError(f"{path} is neither a directory nor a zip archive")
+
+
+def parse_source(name: str, body_md: str) -> Union[ParsedPost, tuple[str, str]]:
+    """
+    Render one file (runs in a worker process). Applies the same front-matter rules as the
+    upload form and register_blog; returns (name, error) instead of raising.
+    """
+    try:
+        meta, body_html, body_text = parse_markdown(body_md)
+        slug = str(meta.pop("slug", "") or "").strip()
+        title = str(meta.pop("title", "") or "").strip()
+        if not slug:
+            return name, "missing front matter: slug"
+        if not title:
+            return name, "missing front matter: title"
+        content_hash = hashlib.sha256(body_md.encode("utf-8")).hexdigest()
+        is_published = not bool(meta.pop("draft", False))
+        published_at = meta.pop("published_at", None)
+        if is_published and not published_at:
+            published_at = datetime.now(timezone.utc)
+        author_email = meta.pop("author", None)
+        meta[CONTENT_HASH_KEY] = content_hash
+        return ParsedPost(
+            source=name,
+            slug=slug,
+            title=title,
+            body_md=body_md,
+            body_html=body_html,
+            body_text=body_text,
+            meta=meta,
+            is_published=is_published,
+            published_at=published_at,
+            author_email=str(author_email) if author_email else None,
+            content_hash=content_hash,
+        )
+    except Exception as exc:  # bad YAML, undecodable markup, ...
+        return name, f"{type(exc).__name__}: {exc}"
+
+
+def _parse_in_worker(item: tuple[str, str]) -> Union[ParsedPost, tuple[str, str]]:
+    return parse_source(*item)
+
+
+def parse_sources(sources: list[tuple[str, str]], *, workers: int = 0) -> list[Union[ParsedPost, tuple[str, str]]]:
+    """Render `sources` in `workers` processes (0 = CPU count), preserving order."""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(sources) < 2:
+        return [parse_source(name, body) for name, body in sources]
+    # spawn: workers only need the markdown pipeline, never the parent's sockets or threads
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        chunksize = max(1, len(sources) // (workers * 4))
+        return list(pool.map(_parse_in_worker, sources, chunksize=chunksize))
+
+
+def _row(post: ParsedPost, author_id: Optional[int]) -> dict[str, Any]:
+    return {
+        "slug": post.slug,
+        "title": post.title,
+        "body_md": post.body_md,
+        "body_html": post.body_html,
+        "body_text": post.body_text,
+        "render_version": RENDERER_VERSION,
+        "meta": post.meta,
+        "is_published": post.is_published,
+        "published_at": post.published_at,
+        "author_id": author_id,
+    }
+
+
+def import_batch(db: Session, posts: list[ParsedPost], *, replace: bool, report: ImportReport) -> None:
+    """
+    Write one batch with a fixed number of queries: a single lookup of existing slugs and
+    their content hashes, a single author lookup, one multi-row INSERT, one bulk UPDATE and
+    one tag rollup upsert.
+    """
+    # keyed like URLs resolve slugs (services.blog_slugs): case and the leading '/' ignored
+    by_slug: dict[str, ParsedPost] = {}
+    for post in posts:
+        key = slug_key(post.slug)
+        if key in by_slug:
+            report.errors.append((post.source, f"duplicate slug {post.slug!r} (also in {by_slug[key].source})"))
+            continue
+        by_slug[key] = post
+    if not by_slug:
+        return
+
+    existing = {
+        slug_key(row.slug): row
+        for row in db.execute(
+            select(
+                BlogPost.id,
+                BlogPost.slug,
+                BlogPost.meta[CONTENT_HASH_KEY].astext.label("content_hash"),
+                BlogPost.is_published,
+                BlogPost.meta["tags"].label("tags"),
+            ).where(func.lower(BlogPost.slug).in_([c for key in by_slug for c in slug_candidates(key)]))
+        )
+    }
+    authors = _resolve_users(db, emails=(p.author_email for p in by_slug.values()))
+
+    inserts, updates, touched = [], [], []
+    for key, post in by_slug.items():
+        author = authors.get((post.author_email or "").lower())
+        current = existing.get(key)
+        if current is None:
+            inserts.append((post, _row(post, author.id if author else None)))
+        elif current.slug.lower() != post.slug.lower():
+            # same URL, other spelling ('/x' vs 'x'): a second row could never be reached
+            report.errors.append((post.source, f"slug_exists: {post.slug!r} resolves to existing {current.slug!r}"))
+        elif current.content_hash == post.content_hash:
+            report.unchanged.append(post.source)
+        elif replace:
+            updates.append((post, {"id": current.id, **_row(post, author.id if author else None)}))
+        else:
+            report.errors.append((post.source, f"slug {post.slug!r} exists with different content (use --replace)"))
+
+    if inserts:
+        created = db.execute(insert(BlogPost).returning(BlogPost.id, BlogPost.slug), [row for _, row in inserts])
+        touched.extend(created.all())
+        report.created.extend(post.source for post, _ in inserts)
+    if updates:
+        db.execute(update(BlogPost), [row for _, row in updates])
+        touched.extend((row["id"], row["slug"]) for _, row in updates)
+        report.updated.extend(post.source for post, _ in updates)
+
+    adjust_tag_counts(
+        db,
+        tag_deltas(
+            before=[(existing[slug_key(post.slug)].is_published, {"tags": existing[slug_key(post.slug)].tags})
+                    for post, _ in updates],
+            after=[(post.is_published, post.meta) for post, _ in inserts + updates],
+        ),
+    )
+    if touched:
+        invalidate_counts(BlogPost)
+        emit(db, BLOG_IMPORTED, post_ids=[post_id for post_id, _ in touched], slugs=[slug for _, slug in touched])
+
+
+def import_blogs(
+    path: Union[str, Path],
+    *,
+    workers: int = 0,
+    replace: bool = False,
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> ImportReport:
+    """
+    Bulk-import a directory or zip of front-matter markdown files.
+
+    Files are rendered in parallel, then written in batches of `batch_size`, each in its own
+    transaction so one bad batch does not discard the rest. Idempotent: a slug whose stored
+    content hash matches is skipped; a changed one is rewritten only with `replace`.
+    """
+    from core.db import uow
+
+    report = ImportReport()
+    parsed = []
+    for result in parse_sources(list(iter_sources(path)), workers=workers):
+        if isinstance(result, ParsedPost):
+            parsed.append(result)
+        else:
+            report.errors.append(result)
+
+    for start in range(0, len(parsed), batch_size):
+        batch = parsed[start:start + batch_size]
+        partial = ImportReport()
+        try:
+            with uow(workload="background") as db:
+                import_batch(db, batch, replace=replace, report=partial)
+        except SQLAlchemyError as exc:
+            # e.g. a slug created concurrently: report the whole batch, keep going
+            message = f"batch failed: {type(getattr(exc, 'orig', None) or exc).__name__}"
+            report.errors.extend((post.source, message) for post in batch)
+            continue
+        report.created += partial.created
+        report.updated += partial.updated
+        report.unchanged += partial.unchanged
+        report.errors += partial.errors
+
+    LOGGER.info(
+        "blog_import_finished",
+        source=str(path),
+        created=len(report.created),
+        updated=len(report.updated),
+        unchanged=len(report.unchanged),
+        errors=len(report.errors),
+    )
+    return report
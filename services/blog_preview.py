@@ -0,0 +1,73 @@
+# services/blog_preview.py
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import Iterable
+
+import yaml
+
+from utilities.cache import LRUCache
+from utilities.parsers.mdown import RENDERER, reference_definitions, split_blocks, split_front_matter
+
+# rendered blocks are small; a few thousand covers several long drafts being edited at once
+_BLOCK_CACHE = LRUCache(4096)
+PREVIEW_MAX_CHARS = 500_000
+
+
+@dataclass(slots=True, frozen=True)
+class PreviewBlock:
+    key: str
+    html: str
+
+
+@dataclass(slots=True, frozen=True)
+class PreviewPatch:
+    """The document as an ordered list of block keys, plus HTML only for keys the client lacks."""
+    order: tuple[str, ...]
+    fresh: tuple[PreviewBlock, ...]
+    rendered: int  # blocks that missed the cache and went through the markdown pipeline
+
+
+def block_key(block: str, references: str) -> str:
+    raw = f"{block}\0{references}".encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()[:20]
+
+
+def _render_block(key: str, block: str, references: str) -> tuple[str, bool]:
+    cached = _BLOCK_CACHE.get(key)
+    if cached is not None:
+        return cached, False
+    source = f"{block}\n\n{references}" if references else block
+    html, _text = RENDERER.render_body(source)
+    _BLOCK_CACHE.set(key, html)
+    return html, True
+
+
+def preview_patch(md: str, *, known: Iterable[str] = ()) -> PreviewPatch:
+    """
+    Split the draft into top-level blocks and render only blocks the client does not already
+    show (`known` keys). Each block is rendered and sanitized once per content hash, so the
+    work per keystroke is one changed block, however long the article is.
+    """
+    md = md[:PREVIEW_MAX_CHARS]
+    try:
+        _meta, body = split_front_matter(md)
+    except yaml.YAMLError:
+        body = md  # half-typed front matter: preview it as text until it parses
+    references = reference_definitions(body)
+    known = set(known)
+
+    order: list[str] = []
+    fresh: list[PreviewBlock] = []
+    rendered = 0
+    for block in split_blocks(body):
+        key = block_key(block, references)
+        order.append(key)
+        if key in known:
+            continue
+        known.add(key)  # a repeated block is sent once; the client clones it
+        html, missed = _render_block(key, block, references)
+        rendered += missed
+        fresh.append(PreviewBlock(key, html))
+    return PreviewPatch(order=tuple(order), fresh=tuple(fresh), rendered=rendered)
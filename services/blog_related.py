@@ -0,0 +1,217 @@
+# services/blog_related.py
+from __future__ import annotations
+
+import os
+import re
+import threading
+from collections import Counter
+from typing import Iterable, Sequence
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from core.events import BLOG_CHANGED, BLOG_IMPORTED, subscribe
+from models.sql.base import BlogPost
+from models.sql.blog import BlogRelated
+from utilities import LOGGER
+
+RELATED_TOP_K = int(os.environ.get("BLOG_RELATED_TOP_K", "4"))
+# below this cosine similarity a neighbour is noise, not "related"
+RELATED_MIN_SCORE = float(os.environ.get("BLOG_RELATED_MIN_SCORE", "0.05"))
+# terms in more than this share of posts ("yoga" on a yoga blog) carry no signal
+MAX_DOCUMENT_FREQUENCY = 0.5
+# bound the dense similarity block to about this many cells per chunk (float32)
+_SIMILARITY_CHUNK_CELLS = 1 << 24
+
+_TOKEN = re.compile(r"[a-z][a-z0-9]{2,}")
+STOP_WORDS = frozenset(
+    "the and for are but not you all any can had her was one our out day get has him his how man new now old see "
+    "two way who boy did its let put say she too use that with have this will your from they know want been good "
+    "much some time very when come here just like long make many more only over such take than them well were "
+    "what into also about would there their which could other these after first where those being should".split()
+)
+_REFRESH_LOCK = threading.Lock()
+
+
+def tokenize(text: str) -> list[str]:
+    return [token for token in _TOKEN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def tfidf_matrix(documents: Sequence[str]):
+    """
+    Rows of L2-normalised sublinear TF-IDF weights (scipy CSR, float32), one per document,
+    so a sparse product of two row sets is their cosine similarity.
+    """
+    import numpy as np
+    from scipy import sparse
+
+    vocabulary: dict[str, int] = {}
+    indptr, indices, counts = [0], [], []
+    for document in documents:
+        for term, count in Counter(tokenize(document)).items():
+            indices.append(vocabulary.setdefault(term, len(vocabulary)))
+            counts.append(count)
+        indptr.append(len(indices))
+
+    n_docs = len(documents)
+    tf = sparse.csr_matrix(
+        (np.asarray(counts, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+        shape=(n_docs, len(vocabulary)),
+    )
+    tf.data = 1.0 + np.log(tf.data)
+
+    df = np.bincount(tf.indices, minlength=len(vocabulary))
+    idf = (np.log((1.0 + n_docs) / (1.0 + df)) + 1.0).astype(np.float32)
+    idf[df > max(1, MAX_DOCUMENT_FREQUENCY * n_docs)] = 0.0
+    weights = tf @ sparse.diags(idf)
+    weights.eliminate_zeros()
+
+    norms = np.sqrt(np.asarray(weights.multiply(weights).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.csr_matrix(sparse.diags(1.0 / norms).astype(np.float32) @ weights)
+
+
+def top_neighbours(matrix, rows: Sequence[int], *, k: int = RELATED_TOP_K):
+    """
+    For each of `rows`, the k most similar other rows of `matrix` and their cosine scores,
+    computed a chunk of rows at a time as one sparse-times-sparse product.
+    Yields (row, neighbour_rows, scores), best first.
+    """
+    import numpy as np
+
+    n_docs = matrix.shape[0]
+    k = min(k, n_docs - 1)
+    if k <= 0:
+        for row in rows:
+            yield row, [], []
+        return
+
+    chunk = max(1, _SIMILARITY_CHUNK_CELLS // n_docs)
+    transposed = matrix.T.tocsc()
+    for start in range(0, len(rows), chunk):
+        block_rows = np.asarray(rows[start:start + chunk])
+        similarity = (matrix[block_rows] @ transposed).toarray()
+        similarity[np.arange(len(block_rows)), block_rows] = -1.0  # never related to itself
+        best = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+        best_scores = np.take_along_axis(similarity, best, axis=1)
+        order = np.argsort(-best_scores, axis=1)
+        best = np.take_along_axis(best, order, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        for row, neighbours, scores in zip(block_rows, best, best_scores):
+            keep = scores >= RELATED_MIN_SCORE
+            yield int(row), neighbours[keep].tolist(), scores[keep].tolist()
+
+
+def _published_corpus(db: Session) -> tuple[list[int], list[str]]:
+    # columns only: the body is deferred with raiseload on the entity
+    rows = db.execute(
+        select(BlogPost.id, BlogPost.title, BlogPost.body_text)
+        .where(BlogPost.is_published.is_(True))
+        .order_by(BlogPost.id)
+    ).all()
+    # title twice: it is short but the best summary of the topic
+    return [row.id for row in rows], [f"{row.title} {row.title} {row.body_text}" for row in rows]
+
+
+def _store(db: Session, ids: list[int], results: Iterable[tuple[int, list[int], list[float]]]) -> int:
+    values = [
+        {"post_id": ids[row], "related_ids": [ids[n] for n in neighbours], "scores": scores}
+        for row, neighbours, scores in results
+    ]
+    if not values:
+        return 0
+    stmt = insert(BlogRelated)
+    for start in range(0, len(values), 1000):
+        db.execute(
+            stmt.values(values[start:start + 1000]).on_conflict_do_update(
+                index_elements=[BlogRelated.post_id],
+                set_={
+                    "related_ids": stmt.excluded.related_ids,
+                    "scores": stmt.excluded.scores,
+                    "computed_at": func.now(),
+                },
+            )
+        )
+    return len(values)
+
+
+def recompute_related(db: Session, *, k: int = RELATED_TOP_K) -> int:
+    """Full batch: vectorise every published post and rewrite all neighbour lists. Returns rows written."""
+    ids, documents = _published_corpus(db)
+    db.execute(delete(BlogRelated).where(BlogRelated.post_id.not_in(ids)) if ids else delete(BlogRelated))
+    if not ids:
+        return 0
+    matrix = tfidf_matrix(documents)
+    return _store(db, ids, top_neighbours(matrix, range(len(ids)), k=k))
+
+
+def refresh_related(db: Session, changed_ids: Iterable[int], *, k: int = RELATED_TOP_K) -> int:
+    """
+    Incremental update after posts were published, edited, unpublished or deleted.
+
+    Recomputes the changed posts' own lists, plus every list the change can affect: lists
+    that contain a changed post, and lists whose weakest entry a changed post now beats.
+    IDF weights are refit on each call, so untouched lists drift slightly until the next
+    full `recompute-related` run.
+    """
+    import numpy as np
+
+    changed = set(changed_ids)
+    ids, documents = _published_corpus(db)
+    position = {post_id: row for row, post_id in enumerate(ids)}
+    gone = [post_id for post_id in changed if post_id not in position]
+    if gone:
+        db.execute(delete(BlogRelated).where(BlogRelated.post_id.in_(gone)))
+    if not ids:
+        return 0
+
+    current = db.execute(select(BlogRelated.post_id, BlogRelated.related_ids, BlogRelated.scores)).all()
+    affected = {position[post_id] for post_id in changed if post_id in position}
+    affected.update(
+        position[row.post_id] for row in current
+        if row.post_id in position and changed.intersection(row.related_ids)
+    )
+
+    matrix = tfidf_matrix(documents)
+    changed_rows = sorted(position[post_id] for post_id in changed if post_id in position)
+    if changed_rows:
+        # similarity of every post to the changed ones, one sparse product
+        to_changed = (matrix @ matrix[changed_rows].T).toarray().max(axis=1)
+        weakest = np.full(len(ids), RELATED_MIN_SCORE, dtype=np.float32)
+        for row in current:
+            if row.post_id in position and len(row.related_ids) >= k and row.scores:
+                weakest[position[row.post_id]] = max(RELATED_MIN_SCORE, min(row.scores))
+        affected.update(int(row) for row in np.nonzero(to_changed > weakest)[0])
+    # posts never computed yet (e.g. the table predates them)
+    known = {row.post_id for row in current}
+    affected.update(row for post_id, row in position.items() if post_id not in known)
+
+    return _store(db, ids, top_neighbours(matrix, sorted(affected), k=k))
+
+
+def _refresh_in_background(post_ids: list[int]) -> None:
+    from core.db import uow
+
+    def _run():
+        with _REFRESH_LOCK:  # one refit at a time per process
+            try:
+                with uow(workload="background") as db:
+                    written = refresh_related(db, post_ids)
+                LOGGER.info("blog_related_refreshed", changed=len(post_ids), written=written)
+            except ImportError:
+                LOGGER.info("blog_related_skipped", reason="numpy/scipy not installed")
+            except Exception:
+                LOGGER.exception("blog_related_refresh_failed", changed=len(post_ids))
+
+    threading.Thread(target=_run, name="blog-related", daemon=True).start()
+
+
+@subscribe(BLOG_CHANGED)
+def _refresh_on_change(*, post_id: int, **_payload) -> None:
+    _refresh_in_background([post_id])
+
+
+@subscribe(BLOG_IMPORTED)
+def _refresh_on_import(*, post_ids: list[int], **_payload) -> None:
+    _refresh_in_background(list(post_ids))
@@ -0,0 +1,143 @@
+# services/blog_render.py
+from __future__ import annotations
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Union
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.orm import Session
+
+from core.events import BLOG_RERENDERED, emit
+from models.sql.base import BlogPost
+from utilities import LOGGER
+from utilities.parsers.mdown import RENDERER, RENDERER_VERSION, split_front_matter
+
+RERENDER_BATCH_SIZE = int(os.environ.get("BLOG_RERENDER_BATCH_SIZE", "100"))
+# pause between batches so the job never holds the primary busy for long stretches
+RERENDER_PAUSE_S = float(os.environ.get("BLOG_RERENDER_PAUSE_S", "0.5"))
+
+_WRITE_RENDERED = (
+    update(BlogPost.__table__)
+    .where(
+        BlogPost.__table__.c.id == bindparam("b_id"),
+        # a post saved by a newer renderer meanwhile (upload, import --replace) keeps its HTML
+        BlogPost.__table__.c.render_version < bindparam("b_version"),
+    )
+    .values(
+        body_html=bindparam("b_html"),
+        body_text=bindparam("b_text"),
+        render_version=bindparam("b_version"),
+        # the HTML changed, so ETags, sitemaps and feeds must see a new timestamp
+        updated_at=func.now(),
+    )
+)
+
+
+@dataclass
+class RerenderReport:
+    total: int = 0
+    rendered: int = 0
+    last_id: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+
+
+def render_stored(item: tuple[int, Optional[str]]) -> Union[tuple[int, str, str], tuple[int, str]]:
+    """
+    Render one stored post (runs in a worker process) the way register_blog does, minus
+    the front matter, which stays as stored in meta. Returns (id, error) instead of raising.
+    """
+    post_id, body_md = item
+    if body_md is None:
+        return post_id, "no stored markdown"
+    try:
+        _meta, body = split_front_matter(body_md)
+        html, text = RENDERER.render_body(body, prettify=True)
+    except Exception as exc:
+        return post_id, f"{type(exc).__name__}: {exc}"
+    return post_id, html, text
+
+
+def count_outdated(db: Session, *, version: int = RENDERER_VERSION) -> int:
+    return db.scalar(select(func.count()).select_from(BlogPost).where(BlogPost.render_version < version)) or 0
+
+
+def outdated_batch(db: Session, *, after_id: int, limit: int, version: int = RENDERER_VERSION) -> list[tuple[int, Optional[str], str]]:
+    """Next (id, body_md, slug) rows below `version`, keyset on id (ix_blog_posts_render_version)."""
+    rows = db.execute(
+        select(BlogPost.id, BlogPost.body_md, BlogPost.slug)
+        .where(BlogPost.render_version < version, BlogPost.id > after_id)
+        .order_by(BlogPost.id)
+        .limit(limit)
+    )
+    return [tuple(row) for row in rows]
+
+
+def write_rendered(db: Session, rendered: list[tuple[int, str, str]], slugs: dict[int, str], *, version: int = RENDERER_VERSION) -> int:
+    if not rendered:
+        return 0
+    db.execute(
+        _WRITE_RENDERED,
+        [{"b_id": post_id, "b_html": html, "b_text": text, "b_version": version} for post_id, html, text in rendered],
+    )
+    post_ids = [post_id for post_id, _html, _text in rendered]
+    emit(db, BLOG_RERENDERED, post_ids=post_ids, slugs=[slugs[post_id] for post_id in post_ids])
+    return len(rendered)
+
+
+def rerender_blogs(
+    *,
+    workers: int = 0,
+    batch_size: int = RERENDER_BATCH_SIZE,
+    pause: float = RERENDER_PAUSE_S,
+    start_after: int = 0,
+    progress: Optional[Callable[[RerenderReport], None]] = None,
+) -> RerenderReport:
+    """
+    Re-render every post whose render_version is below RENDERER_VERSION.
+
+    Reads and writes happen one batch per short transaction on the background pool, with
+    `pause` seconds between batches; rendering runs in `workers` processes (0 = CPU count).
+    The job is resumable by construction: finished posts carry the new version, so a rerun
+    (or `start_after`, the last id reported) continues with what is left. Posts that fail to
+    render keep their old HTML and are reported, not retried within the run.
+    """
+    from core.db import uow
+
+    report = RerenderReport(last_id=start_after)
+    with uow(readonly=True, workload="background") as db:
+        report.total = count_outdated(db)
+
+    workers = workers or os.cpu_count() or 1
+    # spawn: workers only need the markdown pipeline, never the parent's sockets or threads
+    pool = (
+        ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        if workers > 1 else None
+    )
+    try:
+        while True:
+            with uow(readonly=True, workload="background") as db:
+                batch = outdated_batch(db, after_id=report.last_id, limit=batch_size)
+            if not batch:
+                break
+            items = [(post_id, body_md) for post_id, body_md, _slug in batch]
+            results = list(pool.map(render_stored, items)) if pool else [render_stored(item) for item in items]
+
+            rendered = [result for result in results if len(result) == 3]
+            report.errors.extend(result for result in results if len(result) == 2)
+            with uow(workload="background") as db:
+                report.rendered += write_rendered(db, rendered, {post_id: slug for post_id, _md, slug in batch})
+            report.last_id = batch[-1][0]
+
+            LOGGER.info("blog_rerender_batch", rendered=report.rendered, total=report.total, last_id=report.last_id)
+            if progress is not None:
+                progress(report)
+            if pause > 0:
+                time.sleep(pause)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return report
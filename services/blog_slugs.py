@@ -0,0 +1,80 @@
+# services/blog_slugs.py
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from core.events import BLOG_CHANGED, BLOG_IMPORTED, subscribe
+from models.sql.base import BlogPost
+from utilities.cache import TTLCache
+
+# other workers learn about renames/unpublishes only through expiry
+SLUG_CACHE_TTL_S = float(os.environ.get("BLOG_SLUG_CACHE_TTL_S", "60"))
+_SLUG_CACHE = TTLCache(maxsize=10000, ttl=SLUG_CACHE_TTL_S)
+
+
+@dataclass(slots=True, frozen=True)
+class ResolvedSlug:
+    id: int
+    slug: str  # as stored, e.g. "/My-Post"
+
+    @property
+    def path_slug(self) -> str:
+        """The form used in /blog/<slug> URLs (see core.http_cache.blog_post_path)."""
+        return self.slug.lstrip("/")
+
+
+def slug_key(slug: str) -> str:
+    """Case- and slash-insensitive identity of a slug: "/My-Post", "my-post/" -> "my-post"."""
+    return slug.strip().strip("/").lower()
+
+
+def slug_candidates(slug: str) -> list[str]:
+    """
+    Both stored spellings of a slug key, lower-cased. Slugs come from front matter with or
+    without the leading '/', so matching lower(slug) against both keeps the lookup an index
+    probe on uq_blog_posts_slug_lower.
+    """
+    key = slug_key(slug)
+    return [f"/{key}", key]
+
+
+def resolve_slug(db: Session, slug: str) -> Optional[ResolvedSlug]:
+    """The published post a URL slug refers to, whatever its case or leading slash."""
+    row = db.execute(
+        select(BlogPost.id, BlogPost.slug)
+        .where(func.lower(BlogPost.slug).in_(slug_candidates(slug)), BlogPost.is_published.is_(True))
+        .order_by(BlogPost.id)
+        .limit(1)
+    ).first()
+    return ResolvedSlug(row.id, row.slug) if row else None
+
+
+def resolve_slug_cached(db: Session, slug: str) -> Optional[ResolvedSlug]:
+    """resolve_slug through the in-process map; misses are not cached (they are one index probe)."""
+    key = slug_key(slug)
+    resolved = _SLUG_CACHE.get(key)
+    if resolved is None:
+        resolved = resolve_slug(db, key)
+        if resolved is not None:
+            _SLUG_CACHE.set(key, resolved)
+    return resolved
+
+
+def _forget(slugs: Iterable[str]) -> None:
+    for slug in slugs:
+        _SLUG_CACHE.pop(slug_key(slug))
+
+
+@subscribe(BLOG_CHANGED)
+def _forget_changed(*, slug: str, **_payload) -> None:
+    _forget([slug])
+
+
+@subscribe(BLOG_IMPORTED)
+def _forget_imported(*, slugs: list[str], **_payload) -> None:
+    _forget(slugs)
@@ -0,0 +1,122 @@
+# services/blog_tags.py
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping, Optional, Union
+
+from sqlalchemy import Connection, delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from core.events import BLOG_CHANGED, BLOG_IMPORTED, subscribe
+from models.sql.blog import BlogTagCount
+from utilities.cache import TTLCache
+
+TAG_MAX_LENGTH = 100
+TAG_CLOUD_SIZE = 40
+_CLOUD_CACHE = TTLCache(maxsize=8, ttl=300)
+
+
+@dataclass(slots=True, frozen=True)
+class TagCount:
+    tag: str
+    post_count: int
+
+
+def post_tags(meta: Optional[Mapping[str, Any]]) -> tuple[str, ...]:
+    """Distinct, non-empty tags of a post's meta in their front-matter order."""
+    tags = (meta or {}).get("tags")
+    if not isinstance(tags, list):
+        return ()
+    seen: dict[str, None] = {}
+    for tag in tags:
+        if isinstance(tag, str) and tag.strip() and len(tag) <= TAG_MAX_LENGTH:
+            seen.setdefault(tag, None)
+    return tuple(seen)
+
+
+def adjust_tag_counts(db: Session, deltas: Mapping[str, int]) -> None:
+    """
+    Apply +/- published-post deltas to the rollup in the caller's transaction: one upsert for
+    every touched tag, then drop tags no published post carries any more.
+    """
+    deltas = {tag: delta for tag, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    stmt = insert(BlogTagCount).values(
+        [{"tag": tag, "post_count": delta} for tag, delta in sorted(deltas.items())]  # sorted: stable lock order
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[BlogTagCount.tag],
+            set_={"post_count": BlogTagCount.post_count + stmt.excluded.post_count, "updated_at": func.now()},
+        )
+    )
+    db.execute(delete(BlogTagCount).where(BlogTagCount.tag.in_(list(deltas)), BlogTagCount.post_count <= 0))
+
+
+def tag_deltas(
+    before: Iterable[tuple[bool, Optional[Mapping[str, Any]]]] = (),
+    after: Iterable[tuple[bool, Optional[Mapping[str, Any]]]] = (),
+) -> Counter:
+    """Rollup deltas between (is_published, meta) states of the same posts before and after a change."""
+    deltas: Counter = Counter()
+    for published, meta in before:
+        if published:
+            deltas.subtract(post_tags(meta))
+    for published, meta in after:
+        if published:
+            deltas.update(post_tags(meta))
+    return deltas
+
+
+def rebuild_tag_counts(db: Union[Session, Connection]) -> int:
+    """
+    Recompute the whole rollup from blog_posts (backfill / repair); the one place that scans
+    posts. Also runs as a schema upgrade, hence a Connection is accepted. Returns the tag count.
+    """
+    db.execute(delete(BlogTagCount))
+    db.execute(text(
+        "INSERT INTO content.blog_tag_counts (tag, post_count) "
+        "SELECT tag, count(DISTINCT p.id) FROM content.blog_posts AS p "
+        "CROSS JOIN LATERAL jsonb_array_elements_text("
+        "  CASE WHEN jsonb_typeof(p.meta -> 'tags') = 'array' THEN p.meta -> 'tags' ELSE '[]'::jsonb END"
+        ") AS tag "
+        "WHERE p.is_published AND btrim(tag) <> '' AND char_length(tag) <= :max_length "
+        "GROUP BY tag"
+    ), {"max_length": TAG_MAX_LENGTH})
+    _CLOUD_CACHE.clear()
+    return db.scalar(select(func.count()).select_from(BlogTagCount)) or 0
+
+
+def tag_cloud(db: Session, *, limit: int = TAG_CLOUD_SIZE) -> tuple[TagCount, ...]:
+    """Most used tags (rollup only), alphabetical for display."""
+    rows = db.execute(
+        select(BlogTagCount.tag, BlogTagCount.post_count)
+        .order_by(BlogTagCount.post_count.desc(), BlogTagCount.tag)
+        .limit(limit)
+    ).all()
+    return tuple(sorted((TagCount(row.tag, row.post_count) for row in rows), key=lambda t: t.tag.lower()))
+
+
+def tag_cloud_cached(*, limit: int = TAG_CLOUD_SIZE) -> tuple[TagCount, ...]:
+    cached = _CLOUD_CACHE.get(limit)
+    if cached is None:
+        from core.db import uow
+
+        with uow(readonly=True) as db:
+            cached = tag_cloud(db, limit=limit)
+        _CLOUD_CACHE.set(limit, cached)
+    return cached
+
+
+def tag_post_count(db: Session, tag: str) -> int:
+    return db.scalar(select(BlogTagCount.post_count).where(BlogTagCount.tag == tag)) or 0
+
+
+@subscribe(BLOG_CHANGED)
+@subscribe(BLOG_IMPORTED)
+def _drop_cloud_cache(**_payload) -> None:
+    # other workers' caches expire by TTL; this one may have served the writing request
+    _CLOUD_CACHE.clear()
@@ -0,0 +1,173 @@
+# services/blog_views.py
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import re
+import threading
+from collections import Counter
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from models.sql.base import BlogPost
+from models.sql.blog import BlogPopularity, BlogPostViews
+from services.blog import BlogCard, _blog_card, _blog_card_select
+from utilities import LOGGER
+from utilities.cache import TTLCache
+
+VIEW_FLUSH_INTERVAL_S = float(os.environ.get("VIEW_FLUSH_INTERVAL_S", "10"))
+# flush early when this many distinct (post, day) counters are pending
+VIEW_FLUSH_MAX_PENDING = int(os.environ.get("VIEW_FLUSH_MAX_PENDING", "500"))
+POPULARITY_HALF_LIFE_DAYS = float(os.environ.get("POPULARITY_HALF_LIFE_DAYS", "7"))
+POPULARITY_WINDOW_DAYS = int(os.environ.get("POPULARITY_WINDOW_DAYS", "90"))
+MOST_READ_SIZE = 5
+_MOST_READ_CACHE = TTLCache(maxsize=4, ttl=300)
+_UPSERT_VIEWS = text(
+    "INSERT INTO content.blog_post_views (post_id, day, views) "
+    "SELECT v.post_id, v.day, v.views "
+    "FROM jsonb_to_recordset(CAST(:rows AS jsonb)) AS v(post_id bigint, day date, views bigint) "
+    "JOIN content.blog_posts AS p ON p.id = v.post_id "
+    "ON CONFLICT (post_id, day) DO UPDATE SET views = content.blog_post_views.views + EXCLUDED.views"
+)
+_BOTS = re.compile(r"bot|crawl|spider|slurp|preview|facebookexternalhit|monitor|curl|wget", re.IGNORECASE)
+
+
+class ViewCounter:
+    """
+    Per-process read counter. `record` only bumps a dict entry under a lock; a daemon thread
+    writes the accumulated increments every VIEW_FLUSH_INTERVAL_S (or sooner when many are
+    pending) as one multi-row upsert, so reads never become per-request writes.
+    """
+
+    def __init__(self, *, interval: float = VIEW_FLUSH_INTERVAL_S, max_pending: int = VIEW_FLUSH_MAX_PENDING):
+        self.interval = interval
+        self.max_pending = max_pending
+        self._pending: Counter = Counter()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pid: Optional[int] = None
+
+    def record(self, post_id: int, *, day: Optional[date] = None) -> None:
+        self._ensure_flusher()
+        key = (post_id, day or datetime.now(timezone.utc).date())
+        with self._lock:
+            self._pending[key] += 1
+            pending = len(self._pending)
+        if pending >= self.max_pending:
+            self._wake.set()
+
+    def _ensure_flusher(self) -> None:
+        # one thread per process; a forked worker must not inherit the parent's counts or thread
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            self._pending.clear()
+            self._pid = pid
+            threading.Thread(target=self._run, name="blog-view-flush", daemon=True).start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def _take(self) -> Counter:
+        with self._lock:
+            batch, self._pending = self._pending, Counter()
+        return batch
+
+    def flush(self) -> int:
+        """Write pending increments; on failure they are merged back for the next attempt."""
+        batch = self._take()
+        if not batch:
+            return 0
+        from core.db import uow
+
+        try:
+            with uow(workload="background") as db:
+                add_views(db, batch)
+        except Exception:
+            LOGGER.exception("blog_views_flush_failed", counters=len(batch))
+            with self._lock:
+                self._pending.update(batch)
+            return 0
+        return len(batch)
+
+
+def add_views(db: Session, increments: Counter) -> None:
+    """Apply {(post_id, day): n} as one upsert; counts for posts deleted meanwhile are dropped."""
+    rows = [{"post_id": post_id, "day": day.isoformat(), "views": n} for (post_id, day), n in sorted(increments.items())]
+    db.execute(_UPSERT_VIEWS, {"rows": json.dumps(rows)})
+
+
+VIEWS = ViewCounter()
+atexit.register(VIEWS.flush)
+
+
+def record_view(post_id: int, user_agent: Optional[str]) -> None:
+    if user_agent and _BOTS.search(user_agent):
+        return
+    VIEWS.record(post_id)
+
+
+def compute_popularity(
+    db: Session,
+    *,
+    half_life_days: float = POPULARITY_HALF_LIFE_DAYS,
+    window_days: int = POPULARITY_WINDOW_DAYS,
+) -> int:
+    """
+    score = sum(views * 0.5 ^ (age_in_days / half_life)) over the last `window_days`, one
+    INSERT ... SELECT; posts without reads in the window drop out. Returns scored posts.
+    """
+    age = func.current_date() - BlogPostViews.day
+    decayed = func.sum(BlogPostViews.views * func.power(0.5, age / half_life_days))
+    scored = (
+        select(BlogPostViews.post_id, decayed.label("score"))
+        .where(BlogPostViews.day > func.current_date() - window_days)
+        .group_by(BlogPostViews.post_id)
+    )
+    stmt = insert(BlogPopularity).from_select(["post_id", "score"], scored)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[BlogPopularity.post_id],
+            set_={"score": stmt.excluded.score, "computed_at": func.now()},
+        )
+    )
+    db.execute(
+        delete(BlogPopularity).where(
+            BlogPopularity.post_id.not_in(scored.with_only_columns(BlogPostViews.post_id))
+        )
+    )
+    _MOST_READ_CACHE.clear()
+    return db.scalar(select(func.count()).select_from(BlogPopularity)) or 0
+
+
+def most_read(db: Session, *, limit: int = MOST_READ_SIZE) -> list[BlogCard]:
+    stmt = (
+        _blog_card_select()
+        .join(BlogPopularity, BlogPopularity.post_id == BlogPost.id)
+        .order_by(BlogPopularity.score.desc(), BlogPost.id.desc())
+        .limit(limit)
+    )
+    return [_blog_card(row) for row in db.execute(stmt)]
+
+
+def most_read_cached(*, limit: int = MOST_READ_SIZE) -> list[BlogCard]:
+    """The score only moves when the popularity job runs, so a few minutes of staleness is free."""
+    cached = _MOST_READ_CACHE.get(limit)
+    if cached is None:
+        from core.db import uow
+
+        with uow(readonly=True) as db:
+            cached = most_read(db, limit=limit)
+        _MOST_READ_CACHE.set(limit, cached)
+    return cached
@@ -9,7 +9,7 @@ socketio = SocketIO(cors_allowed_origins="*")  # configure CORS as needed
 
 def _write_to_db(message: Message) -> Message:
     """Persist a chat message using the unit-of-work helper."""
-    with uow() as session:
+    with uow(workload="realtime") as session:
         session.add(message)
         session.flush()   # populate PK/server defaults before the UoW commits
         session.refresh(message)
@@ -0,0 +1,89 @@
+# services/counts.py
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+from typing import Hashable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from utilities.cache import TTLCache
+
+# unfiltered totals at or above this many rows (planner estimate) are shown as estimates
+APPROXIMATE_COUNT_ROWS = int(os.environ.get("COUNT_APPROXIMATE_ROWS", "100000"))
+# filtered counts (ILIKE over the table) are skipped entirely on tables at or above this size
+EXPENSIVE_COUNT_ROWS = int(os.environ.get("COUNT_EXPENSIVE_ROWS", "1000000"))
+COUNT_TTL_S = float(os.environ.get("COUNT_TTL_S", "30"))
+
+_COUNT_CACHE = TTLCache(maxsize=1024, ttl=COUNT_TTL_S)
+_ESTIMATE_CACHE = TTLCache(maxsize=64, ttl=60)
+# bumped by invalidate_counts(); part of every cache key, so stale entries are simply never read
+_GENERATIONS: dict[str, int] = {}
+_GENERATIONS_LOCK = threading.Lock()
+
+
+@dataclass(slots=True, frozen=True)
+class RowCount:
+    value: int
+    exact: bool = True
+
+
+def _table_name(model) -> str:
+    return model.__table__.fullname
+
+
+def invalidate_counts(model) -> None:
+    """Drop cached counts for `model`'s table (call after inserts/deletes)."""
+    name = _table_name(model)
+    with _GENERATIONS_LOCK:
+        _GENERATIONS[name] = _GENERATIONS.get(name, 0) + 1
+
+
+def table_estimate(db: Session, model) -> Optional[int]:
+    """
+    Planner row estimate from pg_class.reltuples (kept current by autovacuum/ANALYZE).
+    None when the table has never been analyzed (reltuples = -1).
+    """
+    name = _table_name(model)
+    estimate = _ESTIMATE_CACHE.get(name)
+    if estimate is None:
+        estimate = db.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:name)"),
+            {"name": name},
+        )
+        estimate = -1 if estimate is None else int(estimate)
+        _ESTIMATE_CACHE.set(name, estimate)
+    return estimate if estimate >= 0 else None
+
+
+def count_rows(
+        db: Session,
+        model,
+        count_statement,
+        *,
+        key: Hashable = (),
+        filtered: bool = False,
+) -> Optional[RowCount]:
+    """
+    Dashboard-grade count for `count_statement` (a select(func.count()) over `model`).
+
+    - unfiltered, large table  -> planner estimate (exact=False)
+    - filtered, very large table -> None: the caller should show "more pages available"
+    - otherwise                -> exact count(*), cached for COUNT_TTL_S per `key`
+    """
+    name = _table_name(model)
+    estimate = table_estimate(db, model)
+    if estimate is not None:
+        if not filtered and estimate >= APPROXIMATE_COUNT_ROWS:
+            return RowCount(estimate, exact=False)
+        if filtered and estimate >= EXPENSIVE_COUNT_ROWS:
+            return None
+
+    cache_key = (name, _GENERATIONS.get(name, 0), key)
+    cached = _COUNT_CACHE.get(cache_key)
+    if cached is None:
+        cached = RowCount(db.scalar(count_statement) or 0)
+        _COUNT_CACHE.set(cache_key, cached)
+    return cached
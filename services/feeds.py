@@ -0,0 +1,295 @@
+# services/feeds.py
+from __future__ import annotations
+
+import gzip
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from pathlib import Path
+from typing import Iterable, Optional
+from urllib.parse import quote
+from xml.etree import ElementTree as ET
+
+from flask import Flask, Response, abort, current_app, has_app_context, request, send_file
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from core.events import BLOG_CHANGED, BLOG_IMPORTED, subscribe
+from core.http_cache import blog_post_path
+from models.sql.base import BlogPost, User
+from models.sql.blog import BlogTagCount
+from utilities import LOGGER
+from utilities.fs import atomic_write
+
+FEED_SIZE = 20
+FEED_SUMMARY_CHARS = 400
+# one sitemap file per block of post ids, so a change rewrites only its own block;
+# well under the protocol's 50,000 URLs / 50 MB per file
+SITEMAP_ID_BLOCK = 10000
+# public pages that are not blog posts (paths relative to SITE_URL)
+STATIC_PAGES = ("/", "/about-us", "/blog/", "/search/", "/legal/terms-and-privacy")
+
+RSS_FILE = "feed.xml"
+ATOM_FILE = "atom.xml"
+SITEMAP_INDEX_FILE = "sitemap.xml"
+SITEMAP_PAGES_FILE = "sitemap-pages.xml"
+SITEMAP_TAGS_FILE = "sitemap-tags.xml"
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+ATOM_NS = "http://www.w3.org/2005/Atom"
+_BUILD_LOCK = threading.Lock()
+
+
+def register_feeds(app: Flask) -> None:
+    """
+    RSS/Atom feeds and sitemaps are files under FEEDS_DIR, rewritten when posts change
+    (blog events) and served as-is with validators; fetching one never queries the database.
+    """
+    app.config.setdefault("SITE_URL", os.environ.get("SITE_URL", "https://bodhgriha.com").rstrip("/"))
+    app.config.setdefault("FEEDS_DIR", os.environ.get("FEEDS_DIR", "feeds"))
+
+
+@dataclass(slots=True, frozen=True)
+class FeedEntry:
+    id: int
+    slug: str
+    title: str
+    published_at: Optional[datetime]
+    updated_at: datetime
+    summary: str
+    author_name: Optional[str]
+
+
+def feeds_root(app: Flask) -> Path:
+    return Path(app.config["FEEDS_DIR"])
+
+
+def post_block_file(post_id: int) -> str:
+    return f"sitemap-posts-{post_id // SITEMAP_ID_BLOCK}.xml"
+
+
+def _write(app: Flask, name: str, root: ET.Element) -> None:
+    """Write `name` and a pre-compressed `name.gz` next to it (gzip once, not per fetch)."""
+    payload = ET.tostring(root, encoding="utf-8", xml_declaration=True)
+    target = feeds_root(app) / name
+    atomic_write(target, payload)
+    atomic_write(target.with_name(name + ".gz"), gzip.compress(payload, compresslevel=9, mtime=0))
+
+
+def _remove(app: Flask, name: str) -> None:
+    for path in (feeds_root(app) / name, feeds_root(app) / (name + ".gz")):
+        path.unlink(missing_ok=True)
+
+
+def _iso(value: Optional[datetime]) -> str:
+    value = value or datetime.now(timezone.utc)
+    return value.astimezone(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def _absolute(app: Flask, path: str) -> str:
+    return app.config["SITE_URL"] + path
+
+
+# ---------- feeds
+
+def latest_entries(db: Session, *, limit: int = FEED_SIZE) -> list[FeedEntry]:
+    author_name = func.nullif(func.trim(func.concat_ws(" ", User.first_name, User.last_name)), "")
+    rows = db.execute(
+        select(
+            BlogPost.id,
+            BlogPost.slug,
+            BlogPost.title,
+            BlogPost.published_at,
+            BlogPost.updated_at,
+            func.left(
+                func.coalesce(BlogPost.meta["description"].astext, BlogPost.body_text), FEED_SUMMARY_CHARS
+            ).label("summary"),
+            author_name.label("author_name"),
+        )
+        .join(User, User.id == BlogPost.author_id, isouter=True)
+        .where(BlogPost.is_published.is_(True))
+        .order_by(BlogPost.published_at.desc().nullslast(), BlogPost.id.desc())
+        .limit(limit)
+    ).all()
+    return [FeedEntry(**row._mapping) for row in rows]
+
+
+def build_rss(app: Flask, entries: list[FeedEntry]) -> ET.Element:
+    rss = ET.Element("rss", version="2.0")
+    rss.set("xmlns:atom", ATOM_NS)
+    channel = ET.SubElement(rss, "channel")
+    ET.SubElement(channel, "title").text = "Bodhgriha Blog"
+    ET.SubElement(channel, "link").text = _absolute(app, "/blog/")
+    ET.SubElement(channel, "description").text = "Stories, tips and teachings from the Bodhgriha journal."
+    ET.SubElement(channel, "language").text = "en"
+    ET.SubElement(channel, "atom:link", href=_absolute(app, "/blog/" + RSS_FILE), rel="self", type="application/rss+xml")
+    if entries:
+        newest = max(entry.updated_at for entry in entries)
+        ET.SubElement(channel, "lastBuildDate").text = format_datetime(newest.astimezone(timezone.utc))
+    for entry in entries:
+        url = _absolute(app, blog_post_path(entry.slug))
+        item = ET.SubElement(channel, "item")
+        ET.SubElement(item, "title").text = entry.title
+        ET.SubElement(item, "link").text = url
+        ET.SubElement(item, "guid", isPermaLink="true").text = url
+        ET.SubElement(item, "description").text = entry.summary
+        if entry.published_at:
+            ET.SubElement(item, "pubDate").text = format_datetime(entry.published_at.astimezone(timezone.utc))
+    return rss
+
+
+def build_atom(app: Flask, entries: list[FeedEntry]) -> ET.Element:
+    feed = ET.Element("feed", xmlns=ATOM_NS)
+    ET.SubElement(feed, "title").text = "Bodhgriha Blog"
+    ET.SubElement(feed, "id").text = _absolute(app, "/blog/")
+    ET.SubElement(feed, "link", href=_absolute(app, "/blog/"))
+    ET.SubElement(feed, "link", href=_absolute(app, "/blog/" + ATOM_FILE), rel="self")
+    ET.SubElement(feed, "updated").text = _iso(max((e.updated_at for e in entries), default=None))
+    for entry in entries:
+        url = _absolute(app, blog_post_path(entry.slug))
+        node = ET.SubElement(feed, "entry")
+        ET.SubElement(node, "title").text = entry.title
+        ET.SubElement(node, "id").text = url
+        ET.SubElement(node, "link", href=url)
+        ET.SubElement(node, "published").text = _iso(entry.published_at or entry.updated_at)
+        ET.SubElement(node, "updated").text = _iso(entry.updated_at)
+        ET.SubElement(node, "summary").text = entry.summary
+        author = ET.SubElement(node, "author")
+        ET.SubElement(author, "name").text = entry.author_name or "Bodhgriha"
+    return feed
+
+
+def write_feeds(app: Flask, db: Session) -> None:
+    entries = latest_entries(db)
+    _write(app, RSS_FILE, build_rss(app, entries))
+    _write(app, ATOM_FILE, build_atom(app, entries))
+
+
+# ---------- sitemaps
+
+def _urlset(app: Flask, urls: Iterable[tuple[str, Optional[datetime]]]) -> ET.Element:
+    urlset = ET.Element("urlset", xmlns=SITEMAP_NS)
+    for path, lastmod in urls:
+        url = ET.SubElement(urlset, "url")
+        ET.SubElement(url, "loc").text = _absolute(app, path)
+        if lastmod is not None:
+            ET.SubElement(url, "lastmod").text = _iso(lastmod)
+    return urlset
+
+
+def write_post_block(app: Flask, db: Session, block: int) -> None:
+    """Rewrite the sitemap of posts with id in [block * SITEMAP_ID_BLOCK, (block + 1) * SITEMAP_ID_BLOCK)."""
+    low, high = block * SITEMAP_ID_BLOCK, (block + 1) * SITEMAP_ID_BLOCK
+    rows = db.execute(
+        select(BlogPost.slug, BlogPost.updated_at)
+        .where(BlogPost.is_published.is_(True), BlogPost.id >= low, BlogPost.id < high)
+        .order_by(BlogPost.id)
+    ).all()
+    name = post_block_file(low)
+    if rows:
+        _write(app, name, _urlset(app, ((blog_post_path(row.slug), row.updated_at) for row in rows)))
+    else:
+        _remove(app, name)
+
+
+def write_tag_sitemap(app: Flask, db: Session) -> None:
+    rows = db.execute(select(BlogTagCount.tag, BlogTagCount.updated_at).order_by(BlogTagCount.tag)).all()
+    _write(app, SITEMAP_TAGS_FILE, _urlset(app, ((f"/blog/tag/{quote(row.tag, safe='')}", row.updated_at) for row in rows)))
+
+
+def write_pages_sitemap(app: Flask) -> None:
+    _write(app, SITEMAP_PAGES_FILE, _urlset(app, ((path, None) for path in STATIC_PAGES)))
+
+
+def write_sitemap_index(app: Flask, db: Session) -> None:
+    """List every sitemap file; post blocks carry their newest updated_at (one grouped query)."""
+    block = BlogPost.id // SITEMAP_ID_BLOCK
+    blocks = db.execute(
+        select(block.label("block"), func.max(BlogPost.updated_at).label("lastmod"))
+        .where(BlogPost.is_published.is_(True))
+        .group_by(block)
+        .order_by(block)
+    ).all()
+    tags_lastmod = db.scalar(select(func.max(BlogTagCount.updated_at)))
+
+    index = ET.Element("sitemapindex", xmlns=SITEMAP_NS)
+    entries = [(SITEMAP_PAGES_FILE, None), (SITEMAP_TAGS_FILE, tags_lastmod)]
+    entries += [(post_block_file(row.block * SITEMAP_ID_BLOCK), row.lastmod) for row in blocks]
+    for name, lastmod in entries:
+        node = ET.SubElement(index, "sitemap")
+        ET.SubElement(node, "loc").text = _absolute(app, "/" + name)
+        if lastmod is not None:
+            ET.SubElement(node, "lastmod").text = _iso(lastmod)
+    _write(app, SITEMAP_INDEX_FILE, index)
+
+
+def refresh_feeds(app: Flask, post_ids: Iterable[int]) -> None:
+    """Incremental: the feeds, the sitemap blocks holding `post_ids`, tags and the index."""
+    from core.db import uow
+
+    with _BUILD_LOCK, uow(readonly=True, workload="background") as db:
+        write_feeds(app, db)
+        for block in sorted({post_id // SITEMAP_ID_BLOCK for post_id in post_ids}):
+            write_post_block(app, db, block)
+        write_tag_sitemap(app, db)
+        write_sitemap_index(app, db)
+
+
+def rebuild_feeds(app: Flask) -> int:
+    """Regenerate every feed and sitemap file and drop blocks with no posts left. Returns block count."""
+    from core.db import uow
+
+    with _BUILD_LOCK, uow(readonly=True, workload="background") as db:
+        write_feeds(app, db)
+        write_pages_sitemap(app)
+        write_tag_sitemap(app, db)
+        max_id = db.scalar(select(func.max(BlogPost.id))) or 0
+        blocks = range(max_id // SITEMAP_ID_BLOCK + 1)
+        for block in blocks:
+            write_post_block(app, db, block)
+        write_sitemap_index(app, db)
+    return len(blocks)
+
+
+def send_feed_file(name: str, mimetype: str) -> Response:
+    """
+    Serve a generated file with an ETag/Last-Modified, the pre-gzipped copy when accepted.
+    Everything is built on first use if a deploy has not run `build-feeds` yet.
+    """
+    app = current_app._get_current_object()
+    path = feeds_root(app) / name
+    if not path.exists() and not (feeds_root(app) / SITEMAP_INDEX_FILE).exists():
+        rebuild_feeds(app)
+    if not path.exists():
+        abort(404)
+
+    gz_path = path.with_name(name + ".gz")
+    if "gzip" in request.accept_encodings and gz_path.exists():
+        response = send_file(gz_path, mimetype=mimetype, conditional=True, etag=True)
+        response.content_encoding = "gzip"
+    else:
+        response = send_file(path, mimetype=mimetype, conditional=True, etag=True)
+    response.vary.add("Accept-Encoding")
+    response.cache_control.public = True
+    response.cache_control.max_age = 300
+    return response
+
+
+def _refresh_from_event(post_ids: list[int]) -> None:
+    if not has_app_context():
+        return
+    try:
+        refresh_feeds(current_app._get_current_object(), post_ids)
+    except Exception:
+        LOGGER.exception("feeds_refresh_failed", posts=len(post_ids))
+
+
+@subscribe(BLOG_CHANGED)
+def _refresh_on_change(*, post_id: int, **_payload) -> None:
+    _refresh_from_event([post_id])
+
+
+@subscribe(BLOG_IMPORTED)
+def _refresh_on_import(*, post_ids: list[int], **_payload) -> None:
+    _refresh_from_event(post_ids)
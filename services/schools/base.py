@@ -7,6 +7,13 @@ from sqlalchemy.orm import Session, selectinload
 
 from forms.school import SchoolRegisterForm
 from models.yoga.base import YogaSchool
+from services.counts import RowCount, count_rows
+from utilities.pagination import Keyset, KeysetPage, SortKey, TIMESTAMPTZ_NULLS_LAST
+
+# dashboard order (created_at desc nulls last, id desc); served by ix_schools_created_at_keyset
+SCHOOL_DASHBOARD_KEYSET = Keyset(
+    (SortKey("created_at", YogaSchool.created_at, nulls_as=TIMESTAMPTZ_NULLS_LAST), SortKey("id", YogaSchool.id))
+)
 
 
 def list_schools(
@@ -25,7 +32,8 @@ def list_schools(
         stmt = stmt.where(YogaSchool.is_active.is_(True))
     if search:
         like_expr = f"%{search}%"
-        stmt = stmt.where(YogaSchool.name.ilike(like_expr))
+        stmt = stmt.where(YogaSchool.name.ilike(like_expr))  # ix_schools_name_trgm
+        stmt = stmt.order_by(func.similarity(YogaSchool.name, search).desc())
     stmt = stmt.order_by(YogaSchool.created_at.desc().nullslast(), YogaSchool.id.desc())
     if offset:
         stmt = stmt.offset(offset)
@@ -34,6 +42,26 @@ def list_schools(
     return list(db.scalars(stmt))
 
 
+def page_schools(
+        db: Session,
+        *,
+        include_inactive: bool = True,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        total: Optional[int] = None,
+) -> KeysetPage:
+    """
+    Keyset-paginated variant of list_schools (newest first) with owner eager-loaded.
+    """
+    stmt = select(YogaSchool).options(selectinload(YogaSchool.owner))
+    if not include_inactive:
+        stmt = stmt.where(YogaSchool.is_active.is_(True))
+    if search:
+        stmt = stmt.where(YogaSchool.name.ilike(f"%{search}%"))
+    return SCHOOL_DASHBOARD_KEYSET.paginate(db, stmt, cursor=cursor, limit=limit, total=total)
+
+
 def count_schools(
         db: Session,
         *,
@@ -52,6 +80,30 @@ def count_schools(
     return db.scalar(stmt) or 0
 
 
+def dashboard_count_schools(
+        db: Session,
+        *,
+        include_inactive: bool = True,
+        search: Optional[str] = None,
+) -> Optional[RowCount]:
+    """
+    count_schools for dashboard headers: TTL-cached per filter, estimated when unfiltered
+    and large, None when a filtered count would be too expensive.
+    """
+    stmt = select(func.count()).select_from(YogaSchool)
+    if not include_inactive:
+        stmt = stmt.where(YogaSchool.is_active.is_(True))
+    if search:
+        stmt = stmt.where(YogaSchool.name.ilike(f"%{search}%"))
+    return count_rows(
+        db,
+        YogaSchool,
+        stmt,
+        key=(include_inactive, search),
+        filtered=bool(search) or not include_inactive,
+    )
+
+
 def get_school(db: Session, school_id: int) -> YogaSchool | None:
     """
     Retrieve a single school by primary key.
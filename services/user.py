@@ -5,11 +5,11 @@ import secrets
 import string
 from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, Tuple, List, Optional, Sequence
+from typing import Dict, Any, Tuple, List, Optional, Sequence, Iterable
 
 import pyotp
 from flask import request, g
-from sqlalchemy import select, func
+from sqlalchemy import select, func, cast, Text
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, selectinload
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -20,6 +20,8 @@ from forms.user import LoginForm, AddressForm
 from models.sql import User, RoleBits, UserSession, TwoFAMethod, TwoFactorCredential, Address, Avatar
 from models.yoga.base import YogaSchool
 from utilities import LOGGER
+from utilities.pagination import Keyset, KeysetPage, SortKey
+from services.counts import RowCount, count_rows, invalidate_counts
 
 
 ROLE_LABEL_MAP: tuple[tuple[int, str], ...] = (
@@ -41,6 +43,9 @@ class AdminUserSummary:
     role_labels: Sequence[str]
 
 
+ADMIN_USER_KEYSET = Keyset((SortKey("created_at", User.created_at), SortKey("id", User.id)))
+
+
 def _normalize_boolish(value: Any) -> bool:
     """
     Interpret common truthy/falsy representations found in meta payloads.
@@ -98,13 +103,17 @@ def _apply_admin_user_search_filter(statement, search_field: str | None, search_
             return statement.where(User.id == -1)
         return statement.where(User.id == user_id)
 
-    if field == "email":
-        like_expr = f"%{query}%"
-        return statement.where(User.email.ilike(like_expr))
-
-    # Fallback: search email as default.
+    # email (and the fallback): compare email::text so ix_users_email_trgm applies
     like_expr = f"%{query}%"
-    return statement.where(User.email.ilike(like_expr))
+    return statement.where(cast(User.email, Text).ilike(like_expr))
+
+
+def _admin_user_search_similarity(search_field: str | None, search_value: str | None):
+    """pg_trgm similarity for best-match-first ordering of email searches."""
+    query = (search_value or "").strip()
+    if not query or (search_field or "email").lower() == "user_id":
+        return None
+    return func.similarity(cast(User.email, Text), query)
 
 
 def list_users_for_admin(
@@ -115,19 +124,42 @@ def list_users_for_admin(
         limit: int | None = None,
         offset: int = 0,
 ) -> list[AdminUserSummary]:
-    stmt = (
-        select(User)
-        .options(selectinload(User.addresses))
-        .order_by(User.created_at.desc().nullslast(), User.id.desc())
-    )
+    stmt = select(User).options(selectinload(User.addresses))
     stmt = _apply_admin_user_search_filter(stmt, search_field, search_value)
+    similarity = _admin_user_search_similarity(search_field, search_value)
+    if similarity is not None:
+        stmt = stmt.order_by(similarity.desc())
+    stmt = stmt.order_by(User.created_at.desc().nullslast(), User.id.desc())
 
     if offset:
         stmt = stmt.offset(offset)
     if limit is not None:
         stmt = stmt.limit(limit)
 
-    users = list(db.scalars(stmt))
+    return _summarize_users(db, list(db.scalars(stmt)))
+
+
+def page_users_for_admin(
+        db: Session,
+        *,
+        search_field: str | None = None,
+        search_value: str | None = None,
+        cursor: str | None = None,
+        limit: int = 10,
+        total: int | None = None,
+) -> KeysetPage:
+    """
+    Keyset-paginated variant of list_users_for_admin: constant time at any depth,
+    ordered (created_at desc, id desc). Items are AdminUserSummary rows.
+    """
+    stmt = select(User).options(selectinload(User.addresses))
+    stmt = _apply_admin_user_search_filter(stmt, search_field, search_value)
+    page = ADMIN_USER_KEYSET.paginate(db, stmt, cursor=cursor, limit=limit, total=total)
+    page.items = _summarize_users(db, page.items)
+    return page
+
+
+def _summarize_users(db: Session, users: list[User]) -> list[AdminUserSummary]:
     if not users:
         return []
 
@@ -202,6 +234,23 @@ def count_users_for_admin(
     return db.scalar(stmt) or 0
 
 
+def dashboard_count_users(
+        db: Session,
+        *,
+        search_field: str | None = None,
+        search_value: str | None = None,
+) -> RowCount | None:
+    """
+    count_users_for_admin for dashboard headers: TTL-cached per filter, estimated when
+    unfiltered and large, None when a filtered count would be too expensive.
+    """
+    stmt = select(func.count()).select_from(User)
+    stmt = _apply_admin_user_search_filter(stmt, search_field, search_value)
+    query = (search_value or "").strip()
+    field = (search_field or "email").lower() if query else None
+    return count_rows(db, User, stmt, key=(field, query), filtered=bool(query))
+
+
 def add_user(
         db: Session,
         *,
@@ -240,6 +289,7 @@ def add_user(
         db.rollback()
         LOGGER.error("Email already registered")
         raise ValueError("email_exists") from ie
+    invalidate_counts(User)
     return user
 
 
@@ -397,6 +447,14 @@ def _resolve_user(db: Session, *, email: str) -> Optional[User]:
     return user
 
 
+def _resolve_users(db: Session, *, emails: Iterable[str]) -> dict[str, User]:
+    """Batched _resolve_user: one query for many emails, keyed by lowercased email; unknown ones are absent."""
+    wanted = {email for email in emails if email}
+    if not wanted:
+        return {}
+    return {user.email.lower(): user for user in db.scalars(select(User).where(User.email.in_(wanted)))}
+
+
 def _verify_totp(db: Session, user: User, secret: str) -> None:
     # update verified_at if successful
     cred = db.scalar(
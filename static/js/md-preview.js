@@ -0,0 +1,77 @@
+/**
+ * Live markdown preview for the blog upload page.
+ * HTMX posts the draft (debounced) to blog.preview together with the block keys already
+ * shown; the response carries the new block order and HTML for new blocks only, and this
+ * reconciler moves, clones or drops the existing block nodes to match.
+ */
+(function () {
+  function currentKeys(preview) {
+    return Array.prototype.map.call(preview.children, function (node) {
+      return node.getAttribute("data-block");
+    });
+  }
+
+  function reconcile(preview, html) {
+    var tpl = document.createElement("template");
+    tpl.innerHTML = html.trim();
+    var patch = tpl.content.querySelector("[data-preview-order]");
+    if (!patch) return;
+
+    var order = (patch.getAttribute("data-preview-order") || "").split(" ").filter(Boolean);
+    var pool = {};
+    function keep(node) {
+      var key = node.getAttribute("data-block");
+      (pool[key] = pool[key] || []).push(node);
+    }
+    Array.prototype.slice.call(preview.children).forEach(keep);
+    Array.prototype.slice.call(patch.children).forEach(keep);
+
+    var used = {};
+    var next = order.map(function (key) {
+      var nodes = pool[key] || [];
+      var index = used[key] || 0;
+      used[key] = index + 1;
+      if (index < nodes.length) return nodes[index];
+      return nodes.length ? nodes[0].cloneNode(true) : null;  // repeated block: sent once
+    });
+
+    // append in order (moves existing nodes), then drop what is no longer in the document
+    var fragment = document.createDocumentFragment();
+    next.forEach(function (node) {
+      if (node) fragment.appendChild(node);
+    });
+    preview.replaceChildren(fragment);
+  }
+
+  function init() {
+    var source = document.getElementById("md-preview-source");
+    var preview = document.getElementById("md-preview");
+    if (!source || !preview) return;
+
+    source.addEventListener("htmx:configRequest", function (evt) {
+      evt.detail.parameters.known = currentKeys(preview).join(" ");
+    });
+    source.addEventListener("htmx:afterRequest", function (evt) {
+      if (evt.detail.successful) reconcile(preview, evt.detail.xhr.responseText);
+    });
+
+    // picking a file loads it into the editor, so the upload is previewed before it is sent
+    var fileInput = document.querySelector("input[type=file][name=md_file]");
+    if (fileInput) {
+      fileInput.addEventListener("change", function () {
+        var file = fileInput.files && fileInput.files[0];
+        if (!file) return;
+        file.text().then(function (text) {
+          source.value = text;
+          htmx.trigger(source, "preview");
+        });
+      });
+    }
+  }
+
+  if (document.readyState === "loading") {
+    document.addEventListener("DOMContentLoaded", init);
+  } else {
+    init();
+  }
+})();
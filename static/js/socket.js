@@ -7,7 +7,12 @@
         sendBtn: null,
         currentUser: '',
         receiverId: null,
+        historyUrl: '',
+        olderCursor: '',
+        loadingOlder: false,
     };
+    // start fetching the previous page this close (px) to the top of the thread
+    const OLDER_THRESHOLD_PX = 120;
 
     function sanitize(text) {
         const div = document.createElement('div');
@@ -27,12 +32,10 @@
         ui.listEl.scrollTo({ top: ui.listEl.scrollHeight, behavior: 'smooth' });
     }
 
-    function appendMessage({ sender, content, timestamp }) {
-        if (!ui.listEl) return;
-
+    function buildMessage({ sender, content, timestamp }) {
         const safeSender = sender || 'Unknown';
         const safeContent = sanitize(content || '');
-        if (!safeContent) return;
+        if (!safeContent) return null;
 
         const isSelf = ui.currentUser && safeSender.toLowerCase() === ui.currentUser;
         const li = document.createElement('li');
@@ -74,10 +77,65 @@
         bubble.appendChild(body);
 
         li.appendChild(bubble);
+        return li;
+    }
+
+    function appendMessage(message) {
+        if (!ui.listEl) return;
+        const li = buildMessage(message);
+        if (!li) return;
         ui.listEl.appendChild(li);
         scrollToLatest();
     }
 
+    function prependMessages(messages) {
+        // messages are oldest first; keep the message the reader is looking at in place
+        if (!ui.listEl || !messages.length) return;
+        const fragment = document.createDocumentFragment();
+        messages.forEach((msg) => {
+            const li = buildMessage(msg);
+            if (li) fragment.appendChild(li);
+        });
+        const previousHeight = ui.listEl.scrollHeight;
+        ui.listEl.insertBefore(fragment, ui.listEl.firstChild);
+        ui.listEl.scrollTop += ui.listEl.scrollHeight - previousHeight;
+    }
+
+    function loadOlder() {
+        if (!ui.listEl || !ui.historyUrl || !ui.olderCursor || ui.loadingOlder) return;
+        const listEl = ui.listEl;
+        ui.loadingOlder = true;
+        const url = `${ui.historyUrl}?cursor=${encodeURIComponent(ui.olderCursor)}`;
+        fetch(url, { credentials: 'same-origin', headers: { Accept: 'application/json' } })
+            .then((response) => {
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                return response.json();
+            })
+            .then((page) => {
+                if (listEl !== ui.listEl) return; // another conversation was opened meanwhile
+                prependMessages(page.messages || []);
+                ui.olderCursor = page.next_cursor || '';
+                fillViewport();
+            })
+            .catch((err) => console.warn('Unable to load older messages', err))
+            .finally(() => {
+                if (listEl === ui.listEl) ui.loadingOlder = false;
+            });
+    }
+
+    function fillViewport() {
+        // a short first page leaves nothing to scroll: keep loading until there is
+        if (ui.listEl && ui.listEl.scrollHeight <= ui.listEl.clientHeight) {
+            loadOlder();
+        }
+    }
+
+    function onThreadScroll() {
+        if (ui.listEl && ui.listEl.scrollTop < OLDER_THRESHOLD_PX) {
+            loadOlder();
+        }
+    }
+
     function updateSendState() {
         if (!ui.sendBtn) return;
         ui.sendBtn.disabled = !chatState.connected;
@@ -123,7 +181,13 @@
         const initial = ui.listEl.dataset.initial;
         if (!initial) return;
         try {
-            JSON.parse(initial).forEach((msg) => appendMessage(msg));
+            const fragment = document.createDocumentFragment();
+            JSON.parse(initial).forEach((msg) => {
+                const li = buildMessage(msg);
+                if (li) fragment.appendChild(li);
+            });
+            ui.listEl.appendChild(fragment);
+            ui.listEl.scrollTop = ui.listEl.scrollHeight;
         } catch (err) {
             console.warn('Unable to parse initial chat history', err);
         } finally {
@@ -168,13 +232,18 @@
             sendBtn,
             currentUser: (listEl.dataset.currentUser || '').toLowerCase(),
             receiverId: Number(inputEl.dataset.receiverId || sendBtn.dataset.receiverId || 0),
+            historyUrl: listEl.dataset.historyUrl || '',
+            olderCursor: listEl.dataset.olderCursor || '',
+            loadingOlder: false,
         };
 
         ensureSocket();
         updateSendState();
         preloadHistory();
+        fillViewport();
         autoResize();
 
+        listEl.addEventListener('scroll', onThreadScroll, { passive: true });
         sendBtn.addEventListener('click', send);
         inputEl.addEventListener('keydown', (event) => {
             if (event.key === 'Enter' && !event.shiftKey) {
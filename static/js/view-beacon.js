@@ -0,0 +1,14 @@
+/**
+ * Reports one read of a statically exported blog post (those pages never reach Flask, so the
+ * server cannot count them). The URL comes from the script tag's data-url.
+ */
+(function () {
+  var script = document.currentScript;
+  var url = script && script.getAttribute("data-url");
+  if (!url) return;
+  if (navigator.sendBeacon) {
+    navigator.sendBeacon(url);
+  } else {
+    fetch(url, { method: "POST", keepalive: true, credentials: "omit" }).catch(function () {});
+  }
+})();
@@ -0,0 +1,79 @@
+"""
+Small in-process caches shared by services (thread-safe, no external dependencies).
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class LRUCache:
+    """
+    Bounded mapping with least-recently-used eviction.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        with self._lock:
+            value = self._data.get(key, self._MISSING)
+            if value is self._MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TTLCache(LRUCache):
+    """
+    LRU cache whose entries expire `ttl` seconds after being set.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 30.0):
+        super().__init__(maxsize)
+        self.ttl = ttl
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        entry = super().get(key, self._MISSING)
+        if entry is self._MISSING:
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self.pop(key)
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        super().set(key, (time.monotonic() + (self.ttl if ttl is None else ttl), value))
@@ -4,12 +4,37 @@ from sqlalchemy.exc import ResourceClosedError
 import pandas as pd
 from pandas import DataFrame
 import os
+import threading
+
+# Workload classes get isolated pools so one heavy admin export or batch job cannot
+# starve user-facing pages. Sizes can be overridden with DB_POOL_<CLASS>_SIZE /
+# DB_POOL_<CLASS>_OVERFLOW / DB_POOL_<CLASS>_TIMEOUT.
+WORKLOADS: dict[str, dict[str, int]] = dict(
+    interactive=dict(pool_size=10, max_overflow=10, pool_timeout=5),  # public + member pages
+    realtime=dict(pool_size=4, max_overflow=4, pool_timeout=2),  # chat writes from socket handlers
+    admin=dict(pool_size=3, max_overflow=2, pool_timeout=10),  # dashboards, searches, exports
+    background=dict(pool_size=2, max_overflow=0, pool_timeout=30),  # CLI / batch jobs
+)
+DEFAULT_WORKLOAD = "interactive"
+
+
+def _pool_options(workload: str) -> dict[str, int]:
+    options = dict(WORKLOADS[workload])
+    prefix = f"DB_POOL_{workload.upper()}_"
+    for env_key, option in (("SIZE", "pool_size"), ("OVERFLOW", "max_overflow"), ("TIMEOUT", "pool_timeout")):
+        if os.environ.get(prefix + env_key):
+            options[option] = int(os.environ[prefix + env_key])
+    return options
 
 
 class EngineManager:
     _instances: dict[str, Engine] = dict(
-        BODHGRIHA=create_engine(os.environ.get("DATABASE_URL"))
+        BODHGRIHA=create_engine(
+            os.environ.get("DATABASE_URL"), pool_pre_ping=True, **_pool_options(DEFAULT_WORKLOAD)
+        )
     )
+    _workloads: dict[str, Engine] = dict(interactive=_instances["BODHGRIHA"])
+    _lock = threading.Lock()
 
     def __init__(self): ...
 
@@ -17,6 +42,38 @@ class EngineManager:
     def get(cls, name: str) -> Engine:
         return cls._instances[name]
 
+    @classmethod
+    def for_workload(cls, workload: str) -> Engine:
+        """Engine (and therefore pool) dedicated to a workload class; created on first use."""
+        engine = cls._workloads.get(workload)
+        if engine is not None:
+            return engine
+        if workload not in WORKLOADS:
+            raise KeyError(f"unknown workload class: {workload}")
+        with cls._lock:
+            engine = cls._workloads.get(workload)
+            if engine is None:
+                engine = create_engine(
+                    os.environ.get("DATABASE_URL"), pool_pre_ping=True, **_pool_options(workload)
+                )
+                cls._workloads[workload] = engine
+        return engine
+
+    @classmethod
+    def pool_stats(cls) -> dict[str, dict[str, int]]:
+        """Per-class pool gauges for capacity tuning (only classes that have been used)."""
+        stats = {}
+        for workload, engine in list(cls._workloads.items()):
+            pool = engine.pool
+            stats[workload] = dict(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=pool.overflow(),
+                timeout=int(pool.timeout()),
+            )
+        return stats
+
 
 def execute(
     queries: list[str] | str,
@@ -0,0 +1,40 @@
+"""
+Filesystem helpers for files that are read by other processes (nginx) while being replaced.
+"""
+import os
+import tempfile
+from pathlib import Path
+from typing import Union
+
+
+def atomic_write(path: Union[str, Path], data: Union[str, bytes]) -> None:
+    """
+    Write `data` to `path` so readers see either the old file or the complete new one:
+    write a temp file in the same directory, fsync, then rename over the target.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = data.encode("utf-8") if isinstance(data, str) else data
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(payload)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        os.chmod(tmp_name, 0o644)  # mkstemp creates 0600; the web server must be able to read it
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def remove_file(path: Union[str, Path]) -> bool:
+    """Delete `path` if present; returns whether a file was removed."""
+    try:
+        os.unlink(path)
+        return True
+    except FileNotFoundError:
+        return False
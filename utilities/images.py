@@ -0,0 +1,167 @@
+"""
+Responsive derivatives of blog images.
+
+Originals live in BLOG_IMAGE_DIR. Resized WebP/AVIF/JPEG variants are generated on first
+request and kept in a content-addressed disk cache (sha256 of the original), so replacing
+an original never serves a stale derivative and derivative URLs can be cached forever.
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+import io
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from utilities.cache import LRUCache
+from utilities.fs import atomic_write
+
+BLOG_IMAGE_DIR = Path(os.environ.get("BLOG_IMAGE_DIR", os.path.join("static", "images", "blog")))
+IMAGE_CACHE_DIR = Path(os.environ.get("IMAGE_CACHE_DIR", "image_cache"))
+
+DERIVATIVE_WIDTHS = (320, 640, 960, 1280, 1920)
+# article column is max-w-3xl (48rem); full viewport width below that
+DERIVATIVE_SIZES = "(min-width: 48rem) 48rem, 100vw"
+# preference order for <picture> sources; the last one is the <img> fallback
+DERIVATIVE_FORMATS = ("avif", "webp", "jpeg")
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp", "jpeg": "image/jpeg"}
+_SAVE_OPTIONS = {
+    "avif": {"format": "AVIF", "quality": 55},
+    "webp": {"format": "WEBP", "quality": 78, "method": 4},
+    "jpeg": {"format": "JPEG", "quality": 82, "optimize": True, "progressive": True},
+}
+# URL version tag: enough of the digest to tell two uploads apart
+VERSION_CHARS = 12
+
+_SAFE_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+
+
+@dataclass(frozen=True)
+class SourceImage:
+    filename: str
+    path: Path
+    digest: str
+    width: int
+    height: int
+
+    @property
+    def version(self) -> str:
+        return self.digest[:VERSION_CHARS]
+
+    def widths(self) -> tuple[int, ...]:
+        """Derivative widths for this image; never upscales past the original."""
+        fitting = tuple(w for w in DERIVATIVE_WIDTHS if w < self.width)
+        return fitting + (min(self.width, DERIVATIVE_WIDTHS[-1]),)
+
+    def nearest_width(self, width: int) -> int:
+        """
+        The derivative width serving a request for `width`: the smallest one at least as
+        wide, else the largest. Stored srcsets keep the widths of the image they were
+        rendered for, so a replaced (smaller) original must still answer them.
+        """
+        widths = self.widths()
+        return next((w for w in widths if w >= width), widths[-1])
+
+
+_SOURCES = LRUCache(512)
+# striped: a fixed set of locks however many variants are requested; two variants sharing a
+# stripe only encode one after the other
+_GENERATE_LOCKS = tuple(threading.Lock() for _ in range(64))
+
+
+@functools.lru_cache(maxsize=1)
+def supported_formats() -> tuple[str, ...]:
+    """AVIF needs a Pillow build with libavif (or pillow-avif-plugin); skip it otherwise."""
+    from PIL import Image
+
+    try:
+        import pillow_avif  # noqa: F401  (registers the AVIF plugin on import)
+    except ImportError:
+        pass
+    Image.init()
+    return tuple(fmt for fmt in DERIVATIVE_FORMATS if _SAVE_OPTIONS[fmt]["format"] in Image.SAVE)
+
+
+def source_image(filename: str) -> Optional[SourceImage]:
+    """Metadata for an original in BLOG_IMAGE_DIR, cached by (name, mtime, size); None if unknown."""
+    if not _SAFE_NAME.match(filename):
+        return None
+    path = BLOG_IMAGE_DIR / filename
+    try:
+        stat = path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    key = (filename, stat.st_mtime_ns, stat.st_size)
+    cached = _SOURCES.get(key)
+    if cached is not None:
+        return cached
+
+    from PIL import Image
+
+    data = path.read_bytes()
+    try:
+        with Image.open(io.BytesIO(data)) as img:  # reads the header only
+            width, height = img.size
+    except Exception:
+        return None
+    source = SourceImage(filename, path, hashlib.sha256(data).hexdigest(), width, height)
+    _SOURCES.set(key, source)
+    return source
+
+
+def derivative_path(source: SourceImage, width: int, fmt: str) -> Path:
+    return IMAGE_CACHE_DIR / source.digest[:2] / f"{source.digest}-{width}.{fmt}"
+
+
+def derivative_url(source: SourceImage, width: int, fmt: str) -> str:
+    return f"/blog/images/{source.filename}/{width}.{fmt}?v={source.version}"
+
+
+def _generate_lock(key: str) -> threading.Lock:
+    return _GENERATE_LOCKS[hash(key) % len(_GENERATE_LOCKS)]
+
+
+def derivative(source: SourceImage, width: int, fmt: str) -> Path:
+    """
+    Return the cached derivative, generating it first if needed. Concurrent requests for the
+    same variant in this process wait for one encoder instead of each resizing the original.
+    """
+    if fmt not in supported_formats() or width not in source.widths():
+        raise ValueError(f"unsupported derivative {width}.{fmt}")
+    target = derivative_path(source, width, fmt)
+    if target.exists():
+        return target
+    with _generate_lock(str(target)):
+        if not target.exists():
+            atomic_write(target, _encode(source, width, fmt))
+    return target
+
+
+def _encode(source: SourceImage, width: int, fmt: str) -> bytes:
+    from PIL import Image, ImageOps
+
+    with Image.open(source.path) as img:
+        img.draft("RGB", (width, width))  # JPEG: decode at the smallest scale still >= width
+        img = ImageOps.exif_transpose(img)
+        if img.width > width:
+            img = img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+        if img.mode not in ("RGB", "RGBA") or (fmt == "jpeg" and img.mode != "RGB"):
+            img = img.convert("RGB")
+        out = io.BytesIO()
+        img.save(out, **_SAVE_OPTIONS[fmt])
+    return out.getvalue()
+
+
+def warm(source: SourceImage) -> int:
+    """Generate every variant of `source` (e.g. right after upload); returns how many exist."""
+    formats = supported_formats()
+    count = 0
+    for width in source.widths():
+        for fmt in formats:
+            derivative(source, width, fmt)
+            count += 1
+    return count
@@ -0,0 +1,176 @@
+"""
+Opaque cursor helpers for keyset pagination.
+"""
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Generic, Optional, TypeVar
+
+from sqlalchemy import func, literal, literal_column, tuple_
+from sqlalchemy.orm import Session
+
+T = TypeVar("T")
+
+_DATETIME_TAG = "$dt"
+_DATE_TAG = "$d"
+_AFTER = "a"
+_BEFORE = "b"
+
+# sorts below every real timestamp: NULLs last in a descending keyset (see SortKey.nulls_as)
+TIMESTAMPTZ_NULLS_LAST = literal_column("'-infinity'::timestamptz")
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {_DATETIME_TAG: value.isoformat()}
+    if isinstance(value, date):
+        return {_DATE_TAG: value.isoformat()}
+    raise TypeError(f"cannot encode {type(value).__name__} in a cursor")
+
+
+def _decode_value(obj: dict) -> Any:
+    if len(obj) == 1:
+        if _DATETIME_TAG in obj:
+            return datetime.fromisoformat(obj[_DATETIME_TAG])
+        if _DATE_TAG in obj:
+            return date.fromisoformat(obj[_DATE_TAG])
+    return obj
+
+
+def encode_cursor(values: dict[str, Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":"), sort_keys=True, default=_encode_value).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: Optional[str]) -> Optional[dict[str, Any]]:
+    """Return the cursor payload, or None for a missing/garbled token (treated as first page)."""
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")), object_hook=_decode_value)
+    except (ValueError, UnicodeDecodeError):
+        return None
+    return values if isinstance(values, dict) else None
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """
+    One column of a keyset ordering.
+
+    `attr` is read off each returned row to build the cursor. `nulls_as` is the SQL value
+    NULLs sort as (e.g. '-infinity' to keep them last in a descending listing); the same
+    coalesce is used for ordering and comparison, so an expression index must match it.
+    """
+
+    attr: str
+    column: Any
+    nulls_as: Any = None
+
+    @property
+    def expression(self):
+        if self.nulls_as is None:
+            return self.column
+        return func.coalesce(self.column, self.nulls_as)
+
+    def bind(self, value: Any):
+        if value is None and self.nulls_as is not None:
+            return self.nulls_as
+        return literal(value, self.column.type)
+
+
+@dataclass(slots=True)
+class KeysetPage(Generic[T]):
+    items: list[T]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self) -> bool:
+        return self.prev_cursor is not None
+
+
+@dataclass(frozen=True)
+class Keyset:
+    """
+    Keyset (seek) pagination over a fixed, unique ordering.
+
+    All keys sort in the same direction so the page boundary is a single row-value
+    comparison, e.g. (created_at, id) < (:created_at, :id), which an index on the same
+    columns answers without scanning the skipped rows. The last key must be unique.
+    Cursors are opaque tokens carrying the boundary row's key values and the direction.
+    """
+
+    keys: tuple[SortKey, ...]
+    descending: bool = True
+
+    def _parse(self, cursor: Optional[str]) -> tuple[Optional[list], bool]:
+        payload = decode_cursor(cursor)
+        if not payload:
+            return None, False
+        values = payload.get("k")
+        if not isinstance(values, list) or len(values) != len(self.keys):
+            return None, False
+        return values, payload.get("d") == _BEFORE
+
+    def _values(self, row: Any) -> list:
+        return [getattr(row, key.attr) for key in self.keys]
+
+    def _cursor(self, row: Any, direction: str) -> str:
+        return encode_cursor({"k": self._values(row), "d": direction})
+
+    def order_by(self, statement, *, reverse: bool = False):
+        descending = self.descending != reverse
+        return statement.order_by(
+            *(key.expression.desc() if descending else key.expression.asc() for key in self.keys)
+        )
+
+    def paginate(
+        self,
+        db: Session,
+        statement,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        total: Optional[int] = None,
+        scalars: bool = True,
+    ) -> KeysetPage:
+        """
+        Run `statement` (a select of ORM entities, filters applied, no ORDER BY/LIMIT)
+        for the page after/before `cursor`. Fetches limit + 1 rows to learn whether
+        another page exists; a backward page is read in reverse order and flipped.
+        With scalars=False the statement is a column projection and items are Rows
+        (each must expose the sort keys' attrs as labels).
+        """
+        values, backward = self._parse(cursor)
+        stmt = statement
+        if values is not None:
+            row = tuple_(*(key.expression for key in self.keys))
+            boundary = tuple_(*(key.bind(value) for key, value in zip(self.keys, values)))
+            stmt = stmt.where(row < boundary if self.descending != backward else row > boundary)
+        stmt = self.order_by(stmt, reverse=backward).limit(limit + 1)
+
+        rows = list(db.scalars(stmt) if scalars else db.execute(stmt))
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if backward:
+            rows.reverse()
+            has_prev, has_next = has_more, True
+        else:
+            has_prev, has_next = values is not None, has_more
+
+        if not rows:
+            return KeysetPage(items=[], total=total)
+        return KeysetPage(
+            items=rows,
+            next_cursor=self._cursor(rows[-1], _AFTER) if has_next else None,
+            prev_cursor=self._cursor(rows[0], _BEFORE) if has_prev else None,
+            total=total,
+        )
@@ -1,41 +1,221 @@
+import copy
+import hashlib
+import threading
+from functools import partial
+
 import yaml
 import bleach
 import markdown
 import re
 from bleach.callbacks import nofollow
-from bs4 import BeautifulSoup
+from bleach.html5lib_shim import Filter
+from bleach.linkifier import LinkifyFilter
+
+from utilities.cache import LRUCache
+from utilities import images
 
 
 FRONT = re.compile(r"^\s*---\s*\n(.*?)\n---\s*\n?", re.DOTALL)
 
+ALLOWED_TAGS = [
+    "p", "br", "hr", "h1", "h2", "h3", "h4", "h5", "h6",
+    "ul", "ol", "li", "strong", "em", "b", "i", "blockquote", "code", "pre",
+    "span", "a", "img"
+]
+ALLOWED_ATTRS = {
+    # allow classes on headings/typography
+    **{t: ["class"] for t in
+       ["p", "h1", "h2", "h3", "h4", "h5", "h6", "strong", "em", "b", "i", "code", "pre", "span"]},
+    "a": ["href", "title", "rel", "target", "class"],
+    "img": ["src", "alt", "title", "width", "height", "loading", "class"],
+    # "picture"/"source" and srcset/sizes are added by ResponsiveImageFilter after sanitizing
+}
+ALLOWED_PROTOCOLS = ["http", "https", "mailto"]
+MARKDOWN_EXTENSIONS = ["extra", "sane_lists", "codehilite", "attr_list"]
+# bump when the HTML the pipeline emits changes (tags, attributes, extensions, linkify, filters):
+# memoized renders are keyed by it, and stored posts stamped with an older version are
+# re-rendered by `flask rerender-blogs`
+RENDERER_VERSION = 2
+
+BLOG_IMAGE_SRC = re.compile(r"^/blog/images/([^/?#]+)$")
+
 
-def parse_markdown(md: str) -> tuple[dict, str, str]:
-    ALLOWED_TAGS = [
-        "p", "br", "hr", "h1", "h2", "h3", "h4", "h5", "h6",
-        "ul", "ol", "li", "strong", "em", "b", "i", "blockquote", "code", "pre",
-        "span", "a", "img"
-    ]
-    ALLOWED_ATTRS = {
-        # allow classes on headings/typography
-        **{t: ["class"] for t in
-           ["p", "h1", "h2", "h3", "h4", "h5", "h6", "strong", "em", "b", "i", "code", "pre", "span"]},
-        "a": ["href", "title", "rel", "target", "class"],
-        "img": ["src", "alt", "title", "width", "height", "loading", "class"],
-    }
-
-    meta = {}
+def split_front_matter(md: str) -> tuple[dict, str]:
+    """Return (front matter, markdown body) without rendering anything."""
     m = FRONT.match(md)
-    body = md
-    if m:
-        meta = yaml.safe_load(m.group(1)) or {}
-        body = md[m.end():]
-
-    raw_html = markdown.markdown(body, extensions=["extra", "sane_lists", "codehilite", "attr_list"])
-    clean_html = bleach.clean(raw_html, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRS, strip=True,
-                              protocols=["http", "https", "mailto"], )  # same as above
-    clean_html = bleach.linkify(clean_html, callbacks=[nofollow])
-    soup = BeautifulSoup(clean_html, "html.parser")
-    pretty_html = soup.prettify()
-    plain_text = bleach.clean(raw_html, tags=[], strip=True)
-
-    return meta, pretty_html,  plain_text
+    if not m:
+        return {}, md
+    return yaml.safe_load(m.group(1)) or {}, md[m.end():]
+
+
+FENCE = re.compile(r"^\s{0,3}(`{3,}|~{3,})")
+LIST_ITEM = re.compile(r"^\s{0,3}(?:[*+-]|\d+[.)])\s")
+REFERENCE_DEFINITION = re.compile(r"^\s{0,3}\[[^\]]+\]:\s*\S", re.MULTILINE)
+
+
+def split_blocks(body: str) -> list[str]:
+    """
+    Split markdown (no front matter) into top-level blocks that render independently:
+    blank-line separated, except that fenced code stays whole and indented continuations
+    and consecutive list items stay with their list. Joining the blocks with blank lines
+    renders the same document.
+    """
+    blocks: list[list[str]] = []
+    current: list[str] = []
+    fence: str | None = None
+    pending_blank = False
+
+    for line in body.splitlines():
+        if fence is not None:
+            current.append(line)
+            if line.strip().startswith(fence):
+                fence = None
+            continue
+        if not line.strip():
+            pending_blank = bool(current)
+            continue
+        if pending_blank:
+            indented = line.startswith(("    ", "\t"))
+            if LIST_ITEM.match(current[0]):
+                continues = line[:1] in (" ", "\t") or bool(LIST_ITEM.match(line))  # loose list items
+            else:
+                continues = indented and current[0].startswith(("    ", "\t"))  # indented code
+            if continues:
+                current.append("")
+            else:
+                blocks.append(current)
+                current = []
+            pending_blank = False
+        current.append(line)
+        opened = FENCE.match(line)
+        if opened:
+            fence = opened.group(1)[:3]
+    if current:
+        blocks.append(current)
+    return ["\n".join(block) for block in blocks]
+
+
+def reference_definitions(body: str) -> str:
+    """Link reference definitions ("[id]: url"); appended to each block so references resolve."""
+    return "\n".join(
+        line for line in body.splitlines() if REFERENCE_DEFINITION.match(line)
+    )
+
+
+class ResponsiveImageFilter(Filter):
+    """
+    Wrap images served from /blog/images/ in a <picture> with AVIF/WebP sources and a JPEG
+    srcset, so browsers download a derivative sized for the viewport instead of the original.
+    Runs after sanitizing; unknown images (external, missing files) pass through untouched.
+    """
+
+    def __iter__(self):
+        for token in super().__iter__():
+            if token["type"] in ("StartTag", "EmptyTag") and token["name"] == "img":
+                picture = self._picture(token)
+                if picture is not None:
+                    yield from picture
+                    continue
+            yield token
+
+    @staticmethod
+    def _picture(token):
+        attrs = dict(token["data"])
+        match = BLOG_IMAGE_SRC.match(attrs.get((None, "src"), ""))
+        source = images.source_image(match.group(1)) if match else None
+        if source is None:
+            return None
+        namespace = token.get("namespace")
+
+        def srcset(fmt):
+            return ", ".join(f"{images.derivative_url(source, w, fmt)} {w}w" for w in source.widths())
+
+        *modern, fallback = images.supported_formats()
+        tokens = [{"type": "StartTag", "name": "picture", "namespace": namespace, "data": {}}]
+        for fmt in modern:
+            tokens.append({
+                "type": "EmptyTag", "name": "source", "namespace": namespace,
+                "data": {
+                    (None, "type"): images.MIME_TYPES[fmt],
+                    (None, "srcset"): srcset(fmt),
+                    (None, "sizes"): images.DERIVATIVE_SIZES,
+                },
+            })
+        attrs[(None, "src")] = images.derivative_url(source, source.widths()[-1], fallback)
+        attrs[(None, "srcset")] = srcset(fallback)
+        attrs[(None, "sizes")] = images.DERIVATIVE_SIZES
+        # intrinsic size lets the browser reserve space before the image arrives (no layout shift)
+        attrs.setdefault((None, "width"), str(source.width))
+        attrs.setdefault((None, "height"), str(source.height))
+        attrs.setdefault((None, "loading"), "lazy")
+        attrs[(None, "decoding")] = "async"
+        tokens.append({**token, "type": "EmptyTag", "data": attrs})
+        tokens.append({"type": "EndTag", "name": "picture", "namespace": namespace})
+        return tokens
+
+
+class MarkdownRenderer:
+    """
+    Reusable markdown -> sanitized HTML pipeline.
+
+    markdown.Markdown and bleach.Cleaner keep parser state, so each thread gets its own
+    prebuilt instances. Sanitizing and linkifying happen in a single Cleaner pass.
+    Results are memoized by sha256 of the source (LRU), so re-rendering the same upload
+    is a dictionary lookup.
+    """
+
+    def __init__(self, *, cache_size: int = 256):
+        self._local = threading.local()
+        self._cache = LRUCache(cache_size)
+
+    def _pipeline(self):
+        local = self._local
+        if not hasattr(local, "converter"):
+            local.converter = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+            local.html_cleaner = bleach.Cleaner(
+                tags=ALLOWED_TAGS,
+                attributes=ALLOWED_ATTRS,
+                protocols=ALLOWED_PROTOCOLS,
+                strip=True,
+                filters=[partial(LinkifyFilter, callbacks=[nofollow]), ResponsiveImageFilter],
+            )
+            local.text_cleaner = bleach.Cleaner(tags=[], strip=True)
+        return local
+
+    @staticmethod
+    def cache_key(md: str, prettify: bool) -> str:
+        digest = hashlib.sha256(md.encode("utf-8")).hexdigest()
+        return f"{digest}:{RENDERER_VERSION}" + (":pretty" if prettify else ":raw")
+
+    def render_body(self, body: str, *, prettify: bool = False) -> tuple[str, str]:
+        """Render markdown without front matter → (sanitized html, plain text). Not cached."""
+        pipeline = self._pipeline()
+        raw_html = pipeline.converter.reset().convert(body)
+        clean_html = pipeline.html_cleaner.clean(raw_html)
+        if prettify:
+            from bs4 import BeautifulSoup
+            clean_html = BeautifulSoup(clean_html, "html.parser").prettify()
+        plain_text = pipeline.text_cleaner.clean(raw_html)
+        return clean_html, plain_text
+
+    def render(self, md: str, *, prettify: bool = True) -> tuple[dict, str, str]:
+        key = self.cache_key(md, prettify)
+        cached = self._cache.get(key)
+        if cached is None:
+            meta, body = split_front_matter(md)
+            html, text = self.render_body(body, prettify=prettify)
+            cached = (meta, html, text)
+            self._cache.set(key, cached)
+        meta, html, text = cached
+        # callers pop keys off meta; never hand out the cached dict itself
+        return copy.deepcopy(meta), html, text
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+
+RENDERER = MarkdownRenderer()
+
+
+def parse_markdown(md: str, *, prettify: bool = True) -> tuple[dict, str, str]:
+    return RENDERER.render(md, prettify=prettify)
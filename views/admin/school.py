@@ -1,7 +1,7 @@
 # routes/schools.py
 import math
 
-from flask import Blueprint, render_template, redirect, url_for, flash, request
+from flask import Blueprint, current_app, render_template, redirect, url_for, flash, request
 from flask_login import login_required, current_user
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy import select
@@ -10,7 +10,8 @@ from core.db import uow
 from forms.school import SchoolRegisterForm
 from models.yoga import YogaSchool as School
 from services.base import _context, _invert_navbar_colors
-from services.schools.base import list_schools, get_school, update_school_from_form, count_schools
+from services.counts import invalidate_counts
+from services.schools.base import list_schools, get_school, update_school_from_form, dashboard_count_schools, page_schools
 from utilities.decorators import role_validation
 
 bp = Blueprint("schools", __name__, url_prefix="/schools")
@@ -41,6 +42,7 @@ def register():
                 )
                 db.add(school)
                 db.flush()  # surface unique/constraint errors early; id assigned
+                invalidate_counts(School)
 
                 new_id = school.id
             flash("School registered successfully.", "success")
@@ -96,31 +98,65 @@ def school_dashboard():
     per_page = 8
 
     search_filter = search_query or None
+    # Unfiltered listings page by keyset (constant time at any depth). Searches keep numbered
+    # pages because they are ordered by match similarity, and filtered result sets are small.
+    cursor = request.args.get("cursor") or None
+    pager = None
+
+    total_is_estimate = False
+    more_pages = False
 
     with uow(readonly=True) as db:
-        total_count = count_schools(db, include_inactive=True, search=search_filter)
-        if total_count:
-            total_pages = math.ceil(total_count / per_page)
-            if page > total_pages:
-                page = total_pages
-            offset = (page - 1) * per_page
-            schools = list_schools(
-                db,
-                include_inactive=True,
-                search=search_filter,
-                limit=per_page,
-                offset=offset,
-            )
-        else:
+        if not search_filter:
+            total_count = None
+            if current_app.config.get("DASHBOARD_TOTALS", True):
+                row_count = dashboard_count_schools(db, include_inactive=True)
+                total_count, total_is_estimate = row_count.value, not row_count.exact
+            pager = page_schools(db, include_inactive=True, cursor=cursor, limit=per_page, total=total_count)
+            schools = pager.items
             total_pages = 1
             page = 1
             offset = 0
-            schools = []
+        else:
+            row_count = dashboard_count_schools(db, include_inactive=True, search=search_filter)
+            total_count = row_count.value if row_count else None
+            if total_count is None:
+                # count skipped as too expensive: probe one row past the page instead
+                offset = (page - 1) * per_page
+                schools = list_schools(
+                    db,
+                    include_inactive=True,
+                    search=search_filter,
+                    limit=per_page + 1,
+                    offset=offset,
+                )
+                more_pages = len(schools) > per_page
+                schools = schools[:per_page]
+                total_pages = page + 1 if more_pages else page
+            elif total_count:
+                total_pages = math.ceil(total_count / per_page)
+                if page > total_pages:
+                    page = total_pages
+                offset = (page - 1) * per_page
+                schools = list_schools(
+                    db,
+                    include_inactive=True,
+                    search=search_filter,
+                    limit=per_page,
+                    offset=offset,
+                )
+            else:
+                total_pages = 1
+                page = 1
+                offset = 0
+                schools = []
 
     forms = {}
     query_args = {"page": page}
     if search_query:
         query_args["q"] = search_query
+    if pager is not None and cursor:
+        query_args["cursor"] = cursor
     current_page_url = url_for("schools.school_dashboard", **query_args)
 
     for school in schools:
@@ -130,7 +166,7 @@ def school_dashboard():
         form.next.data = current_page_url
         forms[school.id] = form
 
-    if schools:
+    if schools and pager is None:
         start_index = offset + 1
         end_index = offset + len(schools)
     else:
@@ -150,6 +186,9 @@ def school_dashboard():
             "per_page": per_page,
             "start_index": start_index,
             "end_index": end_index,
+            "pager": pager,
+            "total_is_estimate": total_is_estimate,
+            "more_pages": more_pages,
         }
     )
 
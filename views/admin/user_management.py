@@ -1,11 +1,12 @@
 import math
 
-from flask import Blueprint, render_template, request, url_for
+from flask import Blueprint, current_app, render_template, request, url_for
 from flask_login import login_required
 
 from core.db import uow
+from core.deadline import latency_budget
 from services.base import _context, _invert_navbar_colors
-from services.user import list_users_for_admin, count_users_for_admin
+from services.user import list_users_for_admin, dashboard_count_users, page_users_for_admin
 from utilities.decorators import role_validation
 
 bp = Blueprint("admin_users", __name__, url_prefix="/users")
@@ -14,6 +15,7 @@ bp = Blueprint("admin_users", __name__, url_prefix="/users")
 @bp.route("/dashboard")
 @login_required
 @role_validation("ADMIN")
+@latency_budget(3000, lock_ms=500)
 def user_dashboard():
     admin_context = _invert_navbar_colors(_context())
 
@@ -38,18 +40,49 @@ def user_dashboard():
         except (TypeError, ValueError):
             user_id_error = "User ID must be a number."
 
+    # Unfiltered listings page by keyset (constant time at any depth). Searches keep numbered
+    # pages because they are ordered by match similarity, and filtered result sets are small.
+    cursor = request.args.get("cursor") or None
+    pager = None
+    total_is_estimate = False
+    more_pages = False
+
     with uow(readonly=True) as db:
         if user_id_error:
             total_count = 0
             summaries = []
+        elif not search_query:
+            total_count = None
+            if current_app.config.get("DASHBOARD_TOTALS", True):
+                row_count = dashboard_count_users(db)
+                total_count, total_is_estimate = row_count.value, not row_count.exact
+            pager = page_users_for_admin(db, cursor=cursor, limit=per_page, total=total_count)
+            summaries = pager.items
+            page = 1
+            total_pages = 1
+            offset = 0
         else:
-            total_count = count_users_for_admin(
+            row_count = dashboard_count_users(
                 db,
                 search_field=search_field,
                 search_value=search_query,
             )
+            total_count = row_count.value if row_count else None
 
-            if total_count:
+            if total_count is None:
+                # count skipped as too expensive: probe one row past the page instead
+                offset = (page - 1) * per_page
+                summaries = list_users_for_admin(
+                    db,
+                    search_field=search_field,
+                    search_value=search_query,
+                    limit=per_page + 1,
+                    offset=offset,
+                )
+                more_pages = len(summaries) > per_page
+                summaries = summaries[:per_page]
+                total_pages = page + 1 if more_pages else page
+            elif total_count:
                 total_pages = math.ceil(total_count / per_page)
                 if page > total_pages:
                     page = total_pages
@@ -67,11 +100,11 @@ def user_dashboard():
                 offset = 0
                 summaries = []
 
-    if not total_count:
+    if total_count == 0:
         total_pages = 1
         offset = 0
 
-    if summaries:
+    if summaries and pager is None:
         start_index = offset + 1
         end_index = offset + len(summaries)
     else:
@@ -81,6 +114,8 @@ def user_dashboard():
     query_args = {"page": page, "field": search_field}
     if search_query:
         query_args["q"] = search_query
+    if pager is not None and cursor:
+        query_args["cursor"] = cursor
     current_page_url = url_for("admin_users.user_dashboard", **query_args)
 
     admin_context.update(
@@ -98,6 +133,9 @@ def user_dashboard():
             "end_index": end_index,
             "current_page_url": current_page_url,
             "user_id_error": user_id_error,
+            "pager": pager,
+            "total_is_estimate": total_is_estimate,
+            "more_pages": more_pages,
         }
     )
 
@@ -1,8 +1,9 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import Blueprint, current_app, render_template, request, redirect, url_for, flash
 from forms.blog import BlogUploadForm
 from core.db import uow
+from core.admission import admission_exempt
 from services.blog import register_blog
-from utilities.parsers.mdown import parse_markdown
+from utilities.parsers.mdown import split_front_matter
 from utilities.decorators import role_validation
 from flask_login import login_required
 from services.base import _context, _invert_navbar_colors
@@ -10,6 +11,8 @@ from models.blog.base import BlogDashboardFilters, BlogPaginationView
 
 bp = Blueprint("blog", __name__)
 
+BLOG_INDEX_PAGE_SIZE = 12
+
 
 @bp.route("/upload", methods=["GET", "POST"])
 @login_required
@@ -22,7 +25,7 @@ def upload():
             f = form.md_file.data
             body_md = f.read().decode("utf-8", errors="replace")
 
-            metadata, _, _ = parse_markdown(body_md)
+            metadata, _ = split_front_matter(body_md)  # register_blog does the (cached) render
             slug = metadata.pop("slug")
             
             with uow() as db:
@@ -37,14 +40,34 @@ def upload():
     return render_template("admin/register_blog_form.html", form=form, **_context())
 
 
+@bp.route("/preview", methods=["POST"])
+@login_required
+@role_validation("ADMIN")
+def preview():
+    """
+    HTMX live preview for the upload page. Takes the whole draft plus the block keys the
+    preview already shows and returns the new block order with HTML for new blocks only;
+    static/js/md-preview.js reconciles the DOM.
+    """
+    from services.blog_preview import preview_patch
+
+    patch = preview_patch(request.form.get("markdown", ""), known=request.form.get("known", "").split())
+    return render_template("blog/partials/preview_patch.html", patch=patch)
+
+
 @bp.route("/<string:slug>")
 def view_blog(slug: str):
-    from models.sql import BlogPost, User
+    from models.sql import BlogPost, BlogRelated, BlogTagCount, User
+    from services.blog import more_in_tag, related_cards
+    from utilities.pagination import KeysetPage
     from sqlalchemy import select
-    from sqlalchemy.orm import selectinload
+    from sqlalchemy.orm import selectinload, undefer
     from sqlalchemy import func, literal
+    from core.http_cache import apply_cache_headers, blog_post_etag, viewer_key
+    from services.blog_export import EXPORT_RENDER_ENVIRON_KEY
+    from services.blog_slugs import resolve_slug_cached
+    from services.blog_views import record_view
 
-    slug = '/' + slug if not slug.startswith('/') else slug
     full_name = func.trim(
         func.concat(
             func.coalesce(func.nullif(User.first_name, ''), literal('')),
@@ -54,12 +77,56 @@ def view_blog(slug: str):
     ).label("author_name")
 
     with uow(readonly=True) as db:
-        row = db.execute(
-            select(BlogPost, full_name)
-            .join(User, User.id == BlogPost.author_id, isouter=True)
-            .options(selectinload(BlogPost.author))  # prefetch relationship; won’t lazy-load later
-            .where(BlogPost.slug == slug, BlogPost.is_published.is_(True))
-        ).mappings().first()
+        resolved = resolve_slug_cached(db, slug)
+        if resolved is not None and resolved.path_slug != slug:
+            # wrong case or a slug stored without its '/': send everyone to the one canonical URL
+            return redirect(url_for("blog.view_blog", slug=resolved.path_slug), code=301)
+
+        # validator pre-check: one row by primary key, no bodies, no join
+        # "more in this tag" and "related reading" change when the tag rollup row / the related
+        # row do, so their stamps join the validator
+        first_tag = BlogPost.meta["tags"][0].astext
+        tag_updated_at = (
+            select(BlogTagCount.updated_at).where(BlogTagCount.tag == first_tag).scalar_subquery()
+        )
+        related_at = select(BlogRelated.computed_at).where(BlogRelated.post_id == BlogPost.id).scalar_subquery()
+        stamp = db.execute(
+            select(
+                BlogPost.id,
+                BlogPost.updated_at,
+                first_tag.label("tag"),
+                tag_updated_at.label("tag_updated_at"),
+                related_at.label("related_at"),
+            )
+            .where(BlogPost.id == resolved.id, BlogPost.is_published.is_(True))
+        ).first() if resolved is not None else None
+
+        if stamp is not None:
+            # a revalidated (304) read is still a read; counted in memory, flushed in batches.
+            # a static-export pre-render is not a read: the exported page reports its reads
+            # itself through the view beacon (see record_post_view)
+            exported = bool(request.environ.get(EXPORT_RENDER_ENVIRON_KEY))
+            if not exported:
+                record_view(stamp.id, request.user_agent.string)
+            viewer = viewer_key()
+            changed_at = max(filter(None, (stamp.updated_at, stamp.tag_updated_at, stamp.related_at)))
+            etag = blog_post_etag(stamp.id, changed_at, viewer)
+            if request.if_none_match.contains(etag):
+                not_modified = current_app.response_class(status=304)
+                return apply_cache_headers(not_modified, etag=etag, last_modified=changed_at, viewer=viewer)
+
+            row = db.execute(
+                select(BlogPost, full_name)
+                .join(User, User.id == BlogPost.author_id, isouter=True)
+                .options(selectinload(BlogPost.author))  # prefetch relationship; won’t lazy-load later
+                .options(undefer(BlogPost.body_html))  # bodies are deferred on the model
+                .where(BlogPost.id == stamp.id)
+            ).mappings().first()
+            related_page = KeysetPage(items=related_cards(db, post_id=stamp.id))
+            shown = [stamp.id, *(card.id for card in related_page.items)]
+            more_page = KeysetPage(items=more_in_tag(db, tag=stamp.tag, exclude_ids=shown) if stamp.tag else [])
+        else:
+            row = None
 
     if not row:
         flash("Blog not found.", "error")
@@ -70,10 +137,49 @@ def view_blog(slug: str):
 
     context = _invert_navbar_colors(_context())
 
-    return render_template("blog/post.html", post=post, author_name=author, **context)
+    response = current_app.make_response(
+        render_template(
+            "blog/post.html", post=post, author_name=author, more_tag=stamp.tag, more_page=more_page,
+            related_page=related_page,
+            view_beacon_url=url_for("blog.record_post_view", post_id=stamp.id) if exported else None,
+            **context
+        )
+    )
+    return apply_cache_headers(response, etag=etag, last_modified=changed_at, viewer=viewer)
     
 
+@bp.route("/<int:post_id>/view", methods=["POST"])
+@admission_exempt()
+def record_post_view(post_id: int):
+    """
+    Read beacon from exported pages (navigator.sendBeacon), which nginx serves without Flask.
+    Only bumps the in-memory counter; ids of missing posts are dropped when it is flushed.
+    CSRF-exempt (app.py): the static page has no session to carry a token.
+    """
+    from services.blog_views import record_view
+
+    record_view(post_id, request.user_agent.string)
+    return "", 204
+
+
+@bp.route("/feed.xml")
+@admission_exempt()
+def rss_feed():
+    from services.feeds import RSS_FILE, send_feed_file
+
+    return send_feed_file(RSS_FILE, "application/rss+xml")
+
+
+@bp.route("/atom.xml")
+@admission_exempt()
+def atom_feed():
+    from services.feeds import ATOM_FILE, send_feed_file
+
+    return send_feed_file(ATOM_FILE, "application/atom+xml")
+
+
 @bp.route("/images/<string:filename>")
+@admission_exempt()
 def blog_image(filename: str):
     from flask import send_from_directory, current_app
     import os
@@ -85,15 +191,56 @@ def blog_image(filename: str):
     return send_from_directory(image_dir, filename)
 
 
+@bp.route("/images/<string:filename>/<int:width>.<string:fmt>")
+@admission_exempt()
+def blog_image_derivative(filename: str, width: int, fmt: str):
+    """
+    Resized variant of a blog image, generated on first request. URLs carry ?v=<digest prefix>
+    (see utilities.images.derivative_url), so a matching version is cacheable forever; an old
+    or missing version still gets the current image, just not as immutable. A width this image
+    has no derivative for (a srcset rendered before the original was replaced by a smaller
+    one) is served the nearest derivative instead of a 404.
+    """
+    from flask import abort, send_file
+    from utilities import images
+
+    source = images.source_image(filename)
+    if source is None:
+        abort(404)
+    width = source.nearest_width(width)
+    try:
+        path = images.derivative(source, width, fmt)
+    except ValueError:
+        abort(404)
+
+    response = send_file(path, mimetype=images.MIME_TYPES[fmt], conditional=True, etag=f"{source.version}-{width}.{fmt}")
+    response.cache_control.public = True
+    if request.args.get("v") == source.version:
+        response.cache_control.max_age = 31536000
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.max_age = 300
+    return response
+
+
 @bp.route("/")
 def index():
-    from services.blog import get_all_blogs
+    from services.blog import page_blog_cards
+    from services.blog_tags import tag_cloud_cached
+    from services.blog_views import most_read_cached
+    from utilities.pagination import KeysetPage
+
+    # cards only (no bodies), one page at a time; HTMX fetches the next page on scroll
+    with uow(readonly=True) as db:
+        page = page_blog_cards(db, cursor=request.args.get("cursor") or None, limit=BLOG_INDEX_PAGE_SIZE)
+
+    if request.headers.get("HX-Request"):
+        return render_template("blog/partials/cards.html", page=page)
 
     # set navbar text to black instead of white
     context = _invert_navbar_colors(_context())
-
-    with uow(readonly=True) as db:
-        posts = get_all_blogs(db)
+    tags = tag_cloud_cached()
+    most_read_page = KeysetPage(items=most_read_cached()) if page.items and not request.args.get("cursor") else None
 
     blog_hero_title = "Rooted in Wisdom, Growing in Connection."
     blog_hero_subtitle = "Welcome to Bodhgriha’s journal ..a collection of voices and visions that celebrate the spirit of yoga in everyday life."
@@ -101,15 +248,71 @@ def index():
     return render_template("blog/index.html", 
                            blog_hero_title=blog_hero_title,
                            blog_hero_subtitle=blog_hero_subtitle,
-                           posts=posts, 
+                           page=page,
+                           tags=tags,
+                           most_read_page=most_read_page,
                            **context)
 
 
+@bp.route("/tag/<string:tag>")
+def tag_index(tag: str):
+    from services.blog import page_blog_cards
+    from services.blog_tags import tag_cloud_cached, tag_post_count
+
+    # the rollup answers "does this tag exist" without touching blog_posts
+    with uow(readonly=True) as db:
+        post_count = tag_post_count(db, tag)
+        if not post_count:
+            page = None
+        else:
+            page = page_blog_cards(
+                db, cursor=request.args.get("cursor") or None, limit=BLOG_INDEX_PAGE_SIZE, tag=tag
+            )
+
+    if page is None:
+        flash("No posts with that tag.", "error")
+        return redirect(url_for("blog.index"))
+
+    cards_params = {"tag": tag}
+    if request.headers.get("HX-Request"):
+        return render_template(
+            "blog/partials/cards.html", page=page, cards_endpoint="blog.tag_index", cards_params=cards_params
+        )
+
+    context = _invert_navbar_colors(_context())
+    return render_template(
+        "blog/index.html",
+        blog_hero_title=f"#{tag}",
+        blog_hero_subtitle=f"{post_count} {'post' if post_count == 1 else 'posts'} tagged “{tag}”.",
+        blog_page_title=f"#{tag} · Bodhgriha Blog",
+        page=page,
+        tags=tag_cloud_cached(),
+        current_tag=tag,
+        cards_endpoint="blog.tag_index",
+        cards_params=cards_params,
+        **context,
+    )
+
+
+@bp.route("/search")
+def search():
+    from services.blog import search_blogs_cached
+
+    query = request.args.get("q", "")
+    page = search_blogs_cached(query, cursor=request.args.get("after"))
+
+    if request.headers.get("HX-Request"):
+        return render_template("blog/partials/search_results.html", page=page)
+
+    context = _invert_navbar_colors(_context())
+    return render_template("blog/search.html", page=page, search_query=query.strip(), **context)
+
+
 @bp.route("/dashboard")
 @login_required
 @role_validation("ADMIN")
 def dashboard():
-    from services.blog import get_all_blogs, count_blogs
+    from services.blog import get_all_blogs, dashboard_count_blogs, page_blogs
 
     admin_context = _invert_navbar_colors(_context())
 
@@ -118,38 +321,69 @@ def dashboard():
         query=request.args.get("q"),
         page=request.args.get("page", default=1, type=int),
         per_page=request.args.get("per_page", default=10, type=int),
+        cursor=request.args.get("cursor") or None,
     )
 
     search_query = filters.normalized_query
+    pager = None
 
-    with uow(readonly=True) as db:
-        total_count = count_blogs(
-            db,
-            published_only=False,
-            search=search_query,
-            search_field=filters.field,
-        )
-
-        pagination = BlogPaginationView(
-            total_count=total_count,
-            page=filters.page,
-            per_page=filters.per_page,
-        ).clamp_page()
-
-        if pagination.page != filters.page:
-            filters = filters.copy(update={"page": pagination.page})
+    total_is_estimate = False
 
-        if total_count:
-            posts = get_all_blogs(
+    with uow(readonly=True) as db:
+        if filters.uses_keyset:
+            total_count = None
+            if current_app.config.get("DASHBOARD_TOTALS", True):
+                row_count = dashboard_count_blogs(db)
+                total_count, total_is_estimate = row_count.value, not row_count.exact
+            pager = page_blogs(
                 db,
                 published_only=False,
-                limit=pagination.per_page,
-                offset=filters.offset,
+                cursor=filters.cursor,
+                limit=filters.per_page,
+                total=total_count,
+            )
+            posts = pager.items
+            pagination = BlogPaginationView(total_count=0, page=1, per_page=filters.per_page)
+        else:
+            row_count = dashboard_count_blogs(
+                db,
                 search=search_query,
                 search_field=filters.field,
             )
-        else:
-            posts = []
+            total_count = row_count.value if row_count else None
+
+            pagination = BlogPaginationView(
+                total_count=total_count,
+                page=filters.page,
+                per_page=filters.per_page,
+            ).clamp_page()
+
+            if pagination.page != filters.page:
+                filters = filters.copy(update={"page": pagination.page})
+
+            if total_count is None:
+                # count skipped as too expensive: probe one row past the page instead
+                posts = get_all_blogs(
+                    db,
+                    published_only=False,
+                    limit=pagination.per_page + 1,
+                    offset=filters.offset,
+                    search=search_query,
+                    search_field=filters.field,
+                )
+                pagination = pagination.copy(update={"has_more": len(posts) > pagination.per_page})
+                posts = posts[:pagination.per_page]
+            elif total_count:
+                posts = get_all_blogs(
+                    db,
+                    published_only=False,
+                    limit=pagination.per_page,
+                    offset=filters.offset,
+                    search=search_query,
+                    search_field=filters.field,
+                )
+            else:
+                posts = []
 
     start_index, end_index = pagination.range_indices(len(posts))
 
@@ -169,6 +403,9 @@ def dashboard():
             "total_count": total_count,
             "start_index": start_index,
             "end_index": end_index,
+            "pager": pager,
+            "total_is_estimate": total_is_estimate,
+            "more_pages": pagination.has_more,
         }
     )
 
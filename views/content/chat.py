@@ -1,4 +1,4 @@
-from flask import Blueprint, render_template, request
+from flask import Blueprint, jsonify, render_template, request
 from flask_login import current_user, login_required
 from sqlalchemy import select, union_all
 
@@ -6,40 +6,47 @@ from core.db import uow
 from models.sql.base import User
 from models.sql.chat import Message
 from services.base import _context, _invert_navbar_colors
+from utilities.pagination import Keyset, SortKey
 
 bp = Blueprint("chat", __name__)
 
+# newest first, served by ix_messages_conversation; (sent_at, id) is unique
+CHAT_KEYSET = Keyset((SortKey("sent_at", Message.sent_at), SortKey("id", Message.id)))
+CHAT_HISTORY_PAGE_SIZE = 50
+
 mask_email = lambda email: email[0] + "*****" + email.split("@")[-1] if email else "unknown"
 
 
-def _retrieve_chat_history(db, user, receiver_id):
-    """Return ordered chat history between the current user and receiver."""
+def _retrieve_chat_history(db, user, receiver_id, *, cursor=None, limit=CHAT_HISTORY_PAGE_SIZE):
+    """
+    One page of chat history between the current user and receiver: the newest `limit`
+    messages, or those older than `cursor`. Returns (messages oldest first, cursor for the
+    next older page or None).
+    """
     stmt = (
-        select(Message)
-        .where(
-            Message.sender_id.in_([user.id, receiver_id]),
-            Message.receiver_id.in_([user.id, receiver_id]),
-        )
-        .order_by(Message.sent_at.asc())
+        select(Message.id, Message.content, Message.sent_at, User.email.label("sender_email"))
+        .join(User, User.id == Message.sender_id)
+        .where(Message.between(user.id, receiver_id))
     )
-
-    rows = db.execute(stmt).scalars().all()
-    return [
+    page = CHAT_KEYSET.paginate(db, stmt, cursor=cursor, limit=limit, scalars=False)
+    messages = [
         {
-            "sender": mask_email(row.sender.email),
+            "sender": mask_email(row.sender_email),
             "content": row.content,
             "timestamp": row.sent_at.isoformat() if row.sent_at else None,
         }
-        for row in rows
+        for row in reversed(page.items)
     ]
+    return messages, page.next_cursor
 
 
 def _retrieve_previous_chats(db, user):
     """Return a list of users the current user has chatted with."""
-    sent_stmt = select(Message.receiver_id.label("user_id")).where(Message.sender_id == user.id)
-    received_stmt = select(Message.sender_id.label("user_id")).where(Message.receiver_id == user.id)
+    # the partner is the other side of the conversation key; each branch is an index scan
+    low_stmt = select(Message.user_hi.label("user_id")).where(Message.user_lo == user.id)
+    high_stmt = select(Message.user_lo.label("user_id")).where(Message.user_hi == user.id)
 
-    union_subq = union_all(sent_stmt, received_stmt).subquery()
+    union_subq = union_all(low_stmt, high_stmt).subquery()
 
     users_stmt = (
         select(User)
@@ -57,7 +64,7 @@ def _retrieve_previous_chats(db, user):
 @login_required
 def chat(receiver_id: int):
     with uow(readonly=True) as db:
-        history = _retrieve_chat_history(db, current_user, receiver_id)
+        history, older_cursor = _retrieve_chat_history(db, current_user, receiver_id)
         previous_chats = _retrieve_previous_chats(db, current_user)
 
     base_context = _invert_navbar_colors(_context())
@@ -65,6 +72,7 @@ def chat(receiver_id: int):
         receiver_id=receiver_id,
         reciever_id=receiver_id,
         chat_history=history,
+        older_cursor=older_cursor,
         previous_chats=previous_chats,
         **base_context,
     )
@@ -73,3 +81,14 @@ def chat(receiver_id: int):
         return render_template("user/partials/chat_thread.html", **context)
 
     return render_template("user/chat.html", **context)
+
+
+@bp.route("/user/<int:receiver_id>/history")
+@login_required
+def history(receiver_id: int):
+    """Older messages for infinite scroll: ?cursor= from the previous page, JSON out."""
+    with uow(readonly=True) as db:
+        messages, older_cursor = _retrieve_chat_history(
+            db, current_user, receiver_id, cursor=request.args.get("cursor") or None
+        )
+    return jsonify(messages=messages, next_cursor=older_cursor)